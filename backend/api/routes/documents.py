@@ -1,16 +1,27 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query, Form
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query, Form, Response
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import or_, and_, exists, func, tuple_, update
 from typing import Optional, List
 from backend.database import get_db, StudentDocument, AdmissionForm, StudentProfile, DocumentCategory
-from backend.models.document import DocumentResponse, DocumentDetailResponse
-from backend.utils.file_handler import save_document_file
-from backend.config import settings
-from pathlib import Path
-import os
+from backend.models.document import DOCUMENT_LIST_ADAPTER, DocumentResponse, DocumentDetailResponse
+from backend.utils.file_handler import save_document_file, resolve_upload_path
+from datetime import datetime
+from urllib.parse import urlencode
 
 router = APIRouter()
 
+# DocumentCategory is fixed at import time, so build its payloads once
+CATEGORY_VALUES = [category.value for category in DocumentCategory]
+CATEGORIES_PAYLOAD = {
+    "categories": [{"value": value, "name": value} for value in CATEGORY_VALUES]
+}
+
+def touch_form(db: Session, form_id: int) -> None:
+    """Bump a form's updated_at so its cached detail and ETag change with its documents."""
+    db.execute(
+        update(AdmissionForm).where(AdmissionForm.id == form_id).values(updated_at=datetime.utcnow())
+    )
+
 @router.post("/upload", response_model=DocumentResponse, status_code=201)
 async def upload_document(
     file: UploadFile = File(...),
@@ -30,7 +41,7 @@ async def upload_document(
     except ValueError:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid document category. Must be one of: {[c.value for c in DocumentCategory]}"
+            detail=f"Invalid document category. Must be one of: {CATEGORY_VALUES}"
         )
     
     # Validate that at least one link is provided
@@ -40,16 +51,14 @@ async def upload_document(
             detail="Either form_id or student_profile_id must be provided"
         )
     
-    # Validate form_id if provided
+    # Validate form_id if provided (existence check only, no row hydration)
     if form_id:
-        form = db.query(AdmissionForm).filter(AdmissionForm.id == form_id).first()
-        if not form:
+        if not db.query(exists().where(AdmissionForm.id == form_id)).scalar():
             raise HTTPException(status_code=404, detail="Form not found")
     
     # Validate student_profile_id if provided
     if student_profile_id:
-        profile = db.query(StudentProfile).filter(StudentProfile.id == student_profile_id).first()
-        if not profile:
+        if not db.query(exists().where(StudentProfile.id == student_profile_id)).scalar():
             raise HTTPException(status_code=404, detail="Student profile not found")
     
     try:
@@ -67,10 +76,14 @@ async def upload_document(
             student_profile_id=student_profile_id
         )
         db.add(document)
+        if form_id:
+            touch_form(db, form_id)
+        # Flush assigns the id and defaults; serialise before commit expires the row
+        db.flush()
+        document_data = DocumentResponse.model_validate(document)
         db.commit()
-        db.refresh(document)
         
-        return DocumentResponse.model_validate(document)
+        return document_data
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -78,52 +91,63 @@ async def upload_document(
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 @router.get("/{document_id}", response_model=DocumentDetailResponse)
-async def get_document(document_id: int, db: Session = Depends(get_db)):
+def get_document(document_id: int, db: Session = Depends(get_db)):
     """Get detailed information about a specific document"""
-    document = db.query(StudentDocument).filter(StudentDocument.id == document_id).first()
+    document = db.query(StudentDocument).options(raiseload('*')).filter(
+        StudentDocument.id == document_id
+    ).first()
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     return DocumentDetailResponse.model_validate(document)
 
 @router.get("/forms/{form_id}/documents", response_model=List[DocumentResponse])
-async def get_form_documents(form_id: int, db: Session = Depends(get_db)):
+def get_form_documents(form_id: int, db: Session = Depends(get_db)):
     """Get all documents attached to a specific form"""
-    form = db.query(AdmissionForm).filter(AdmissionForm.id == form_id).first()
+    form = db.query(AdmissionForm).options(raiseload('*')).filter(AdmissionForm.id == form_id).first()
     if not form:
         raise HTTPException(status_code=404, detail="Form not found")
     
-    documents = db.query(StudentDocument).filter(
+    # Responses only use document columns; never lazy-load form/profile per row
+    documents = db.query(StudentDocument).options(raiseload('*')).filter(
         StudentDocument.form_id == form_id
     ).order_by(StudentDocument.upload_date.desc()).all()
     
-    return [DocumentResponse.model_validate(doc) for doc in documents]
+    return DOCUMENT_LIST_ADAPTER.validate_python(documents, from_attributes=True)
 
 @router.get("/students/{profile_id}/documents", response_model=List[DocumentResponse])
-async def get_student_documents(profile_id: int, db: Session = Depends(get_db)):
+def get_student_documents(profile_id: int, db: Session = Depends(get_db)):
     """Get all documents attached to a student profile"""
     profile = db.query(StudentProfile).filter(StudentProfile.id == profile_id).first()
     if not profile:
         raise HTTPException(status_code=404, detail="Student profile not found")
     
-    documents = db.query(StudentDocument).filter(
+    # Responses only use document columns; never lazy-load form/profile per row
+    documents = db.query(StudentDocument).options(raiseload('*')).filter(
         StudentDocument.student_profile_id == profile_id
     ).order_by(StudentDocument.upload_date.desc()).all()
     
-    return [DocumentResponse.model_validate(doc) for doc in documents]
+    return DOCUMENT_LIST_ADAPTER.validate_python(documents, from_attributes=True)
 
 @router.get("/search/results", response_model=List[DocumentResponse])
-async def search_documents(
+def search_documents(
+    response: Response,
     document_category: Optional[str] = Query(None),
     student_name: Optional[str] = Query(None),
     form_id: Optional[int] = Query(None),
     student_profile_id: Optional[int] = Query(None),
-    date_from: Optional[str] = Query(None),
-    date_to: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor_upload_date: Optional[datetime] = Query(None),
+    cursor_id: Optional[int] = Query(None),
     db: Session = Depends(get_db)
 ):
-    """Search documents by various criteria"""
+    """
+    Search documents by various criteria.
+    Pass cursor_upload_date + cursor_id (from the X-Next-Cursor header of the
+    previous response) to page by keyset instead of page number.
+    """
     query = db.query(StudentDocument)
     
     # Build filters
@@ -144,57 +168,60 @@ async def search_documents(
     if student_name:
         # Join with student profiles to search by name
         query = query.join(StudentProfile, StudentDocument.student_profile_id == StudentProfile.id)
-        filters.append(StudentProfile.student_name.ilike(f"%{student_name}%"))
+        # Match on lower(student_name) so the trigram index can serve the lookup
+        filters.append(func.lower(StudentProfile.student_name).like(f"%{student_name.lower()}%"))
     
     if date_from:
-        try:
-            from datetime import datetime
-            date_from_obj = datetime.fromisoformat(date_from.replace('Z', '+00:00'))
-            filters.append(StudentDocument.upload_date >= date_from_obj)
-        except:
-            pass
+        filters.append(StudentDocument.upload_date >= date_from)
     
     if date_to:
-        try:
-            from datetime import datetime
-            date_to_obj = datetime.fromisoformat(date_to.replace('Z', '+00:00'))
-            filters.append(StudentDocument.upload_date <= date_to_obj)
-        except:
-            pass
+        filters.append(StudentDocument.upload_date <= date_to)
     
     if filters:
         query = query.filter(and_(*filters))
     
-    # Pagination
-    skip = (page - 1) * limit
-    documents = query.order_by(StudentDocument.upload_date.desc()).offset(skip).limit(limit).all()
+    query = query.order_by(StudentDocument.upload_date.desc(), StudentDocument.id.desc())
+
+    # Pagination - keyset when a cursor is given, offset otherwise
+    if cursor_upload_date is not None and cursor_id is not None:
+        query = query.filter(
+            tuple_(StudentDocument.upload_date, StudentDocument.id) < tuple_(cursor_upload_date, cursor_id)
+        )
+    else:
+        query = query.offset((page - 1) * limit)
+    documents = query.limit(limit).all()
+
+    if len(documents) == limit:
+        last = documents[-1]
+        response.headers["X-Next-Cursor"] = urlencode(
+            {"cursor_upload_date": last.upload_date.isoformat(), "cursor_id": last.id}
+        )
     
-    return [DocumentResponse.model_validate(doc) for doc in documents]
+    return DOCUMENT_LIST_ADAPTER.validate_python(documents, from_attributes=True)
 
 @router.delete("/{document_id}", status_code=204)
-async def delete_document(document_id: int, db: Session = Depends(get_db)):
+def delete_document(document_id: int, db: Session = Depends(get_db)):
     """Delete a document and its associated file"""
     document = db.query(StudentDocument).filter(StudentDocument.id == document_id).first()
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    # Delete file if it exists
-    upload_dir = Path(settings.UPLOAD_DIR).resolve()
-    full_file_path = upload_dir / document.file_path
-    if full_file_path.exists():
-        try:
-            os.remove(full_file_path)
-        except Exception as e:
-            print(f"Warning: Could not delete file {full_file_path}: {e}")
-    
+    file_path = document.file_path
+    if document.form_id:
+        touch_form(db, document.form_id)
     db.delete(document)
     db.commit()
+    
+    # Remove the file only once the row is gone; unlink(missing_ok) replaces the
+    # separate exists() check
+    try:
+        resolve_upload_path(file_path).unlink(missing_ok=True)
+    except Exception as e:
+        print(f"Warning: Could not delete file {file_path}: {e}")
     return None
 
 @router.get("/categories/list")
-async def get_document_categories():
+async def get_document_categories(response: Response):
     """Get list of available document categories"""
-    return {
-        "categories": [{"value": cat.value, "name": cat.value} for cat in DocumentCategory]
-    }
-
+    response.headers["Cache-Control"] = "public, max-age=86400, immutable"
+    return CATEGORIES_PAYLOAD
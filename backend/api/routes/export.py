@@ -1,19 +1,44 @@
 import logging
+import threading
+import time
+from collections import OrderedDict
 
-from fastapi import APIRouter, Response, Depends, Query
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from typing import Optional, Dict, Any, Iterable
+from sqlalchemy import DateTime, Enum as SQLEnum, JSON, event
+from sqlalchemy.orm import Session, load_only, raiseload, ORMExecuteState
+from typing import Optional, Dict, Any, Iterable, Iterator, Union
 from datetime import datetime
 from backend.database import get_db, AdmissionForm, FormStatus
 from backend.api.routes.forms import apply_form_filters
 import csv
+import hashlib
+import itertools
 import json
+import operator
 import io
+import orjson
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round-trip while streaming an export
+EXPORT_CHUNK_SIZE = 1000
+# CSV rows buffered per response chunk
+CSV_BATCH_SIZE = 500
+# Finished exports are kept briefly so repeated identical requests skip the query
+EXPORT_CACHE_TTL_SECONDS = 60
+EXPORT_CACHE_MAX_ENTRIES = 64
+# Exports larger than this are streamed but never kept; the cache as a whole is
+# bounded by total size so large exports cannot pile up in memory
+EXPORT_CACHE_MAX_ENTRY_BYTES = 4 * 1024 * 1024
+EXPORT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "admission_forms.csv"),
+    "json": ("application/json", "admission_forms.json"),
+}
+
 EXPORT_FIELDS = [
     ("id", "Form ID"),
     ("filename", "Filename"),
@@ -74,38 +99,167 @@ EXPORT_FIELDS = [
     ("additional_info", "Additional Info"),
 ]
 
-def form_to_csv_row(form: AdmissionForm) -> list[str]:
-    row: list[str] = []
-    for attr, _ in EXPORT_FIELDS:
-        value = getattr(form, attr, None)
-        if isinstance(value, datetime):
-            value = value.isoformat()
-        elif isinstance(value, FormStatus):
-            value = value.value
-        elif isinstance(value, dict):
-            value = json.dumps(value, ensure_ascii=False)
-        elif value is None:
-            value = ""
-        row.append(str(value) if not isinstance(value, str) else value)
-    return row
+# Only the exported columns are fetched; extracted_data (raw OCR JSON) is skipped
+EXPORT_COLUMNS = tuple(getattr(AdmissionForm, attr) for attr, _ in EXPORT_FIELDS)
 
 
-def form_to_json_dict(form: AdmissionForm) -> Dict[str, Any]:
-    record: Dict[str, Any] = {}
+def _csv_text(value: Any) -> str:
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+
+def _csv_datetime(value: Optional[datetime]) -> str:
+    return value.isoformat() if value is not None else ""
+
+
+def _csv_enum(value: Any) -> str:
+    return value.value if isinstance(value, FormStatus) else _csv_text(value)
+
+
+def _csv_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False) if isinstance(value, dict) else _csv_text(value)
+
+
+def _json_datetime(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _json_enum(value: Any) -> Any:
+    return value.value if isinstance(value, FormStatus) else value
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _build_converters() -> tuple[tuple, tuple]:
+    """Pick a CSV and a JSON converter per exported column from its SQL type."""
+    csv_columns = []
+    json_columns = []
     for attr, _ in EXPORT_FIELDS:
-        value = getattr(form, attr, None)
-        if isinstance(value, datetime):
-            record[attr] = value.isoformat()
-        elif isinstance(value, FormStatus):
-            record[attr] = value.value
-        elif isinstance(value, dict):
-            record[attr] = value
+        column_type = AdmissionForm.__table__.columns[attr].type
+        if isinstance(column_type, DateTime):
+            converters = (_csv_datetime, _json_datetime)
+        elif isinstance(column_type, SQLEnum):
+            converters = (_csv_enum, _json_enum)
+        elif isinstance(column_type, JSON):
+            converters = (_csv_json, _identity)
         else:
-            record[attr] = value
+            converters = (_csv_text, _identity)
+        getter = operator.attrgetter(attr)
+        csv_columns.append((getter, converters[0]))
+        json_columns.append((attr, getter, converters[1]))
+    return tuple(csv_columns), tuple(json_columns)
+
+
+_CSV_COLUMNS, _JSON_COLUMNS = _build_converters()
+
+
+def form_to_csv_row(form: AdmissionForm) -> list[str]:
+    return [convert(get(form)) for get, convert in _CSV_COLUMNS]
+
+
+def form_to_json_dict(form: AdmissionForm) -> Dict[str, Any]:
+    record: Dict[str, Any] = {attr: convert(get(form)) for attr, get, convert in _JSON_COLUMNS}
     if record.get("additional_info") is None:
         record["additional_info"] = {}
     return record
 
+ExportChunk = Union[str, bytes]
+
+# key -> (stored_at, chunks, size in bytes/characters)
+_export_cache: "OrderedDict[str, tuple[float, list[ExportChunk], int]]" = OrderedDict()
+_export_cache_lock = threading.Lock()
+_export_cache_size = 0
+# Bumped on every form write so exports already in flight are not cached stale
+_export_cache_generation = 0
+
+
+def _export_cache_key(format: str, filters: Dict[str, Any]) -> str:
+    payload = orjson.dumps({"format": format, "filters": filters}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _get_cached_export(key: str) -> Optional[list[ExportChunk]]:
+    with _export_cache_lock:
+        entry = _export_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, chunks, _ = entry
+        if time.monotonic() - stored_at > EXPORT_CACHE_TTL_SECONDS:
+            _evict_export(key)
+            return None
+        _export_cache.move_to_end(key)
+        return chunks
+
+
+def _evict_export(key: Optional[str] = None) -> None:
+    """Drop one entry (the least recently used by default); caller holds the lock."""
+    global _export_cache_size
+    if key is None:
+        _, (_, _, size) = _export_cache.popitem(last=False)
+    else:
+        _, _, size = _export_cache.pop(key)
+    _export_cache_size -= size
+
+
+def _cache_export_chunks(key: str, chunks: Iterator[ExportChunk]) -> Iterator[ExportChunk]:
+    """
+    Pass chunks through to the client and keep them once the export completes,
+    unless the export grows past EXPORT_CACHE_MAX_ENTRY_BYTES.
+    """
+    global _export_cache_size
+    generation = _export_cache_generation
+    collected: Optional[list[ExportChunk]] = []
+    size = 0
+    for chunk in chunks:
+        if collected is not None:
+            size += len(chunk)
+            if size > EXPORT_CACHE_MAX_ENTRY_BYTES:
+                # Too large to keep; release what was collected and just stream the rest
+                collected = None
+            else:
+                collected.append(chunk)
+        yield chunk
+
+    if collected is None:
+        return
+    with _export_cache_lock:
+        if generation != _export_cache_generation:
+            return
+        if key in _export_cache:
+            _evict_export(key)
+        _export_cache[key] = (time.monotonic(), collected, size)
+        _export_cache_size += size
+        while _export_cache and (
+            len(_export_cache) > EXPORT_CACHE_MAX_ENTRIES or _export_cache_size > EXPORT_CACHE_MAX_BYTES
+        ):
+            _evict_export()
+
+
+def _invalidate_export_cache(*_args) -> None:
+    global _export_cache_generation, _export_cache_size
+    with _export_cache_lock:
+        _export_cache_generation += 1
+        _export_cache.clear()
+        _export_cache_size = 0
+
+
+def _invalidate_on_bulk_write(orm_execute_state: ORMExecuteState) -> None:
+    # ORM-enabled update()/delete() statements bypass the mapper events below
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and (
+        orm_execute_state.bind_mapper is not None
+        and orm_execute_state.bind_mapper.class_ is AdmissionForm
+    ):
+        _invalidate_export_cache()
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(AdmissionForm, _event_name, _invalidate_export_cache)
+event.listen(Session, "do_orm_execute", _invalidate_on_bulk_write)
+
+
 @router.get("/export")
 async def export_forms(
     format: str = Query("csv", regex="^(csv|json)$"),
@@ -121,7 +275,7 @@ async def export_forms(
     db: Session = Depends(get_db)
 ):
     """Export verified forms to CSV or JSON"""
-    query = db.query(AdmissionForm)
+    query = db.query(AdmissionForm).options(load_only(*EXPORT_COLUMNS), raiseload('*'))
 
     query = apply_form_filters(
         query,
@@ -131,15 +285,16 @@ async def export_forms(
         enrollment_number=enrollment_number,
         application_number=application_number,
         course_applied=course_applied,
-        status=status,
+        # Exports default to verified forms unless a status is requested
+        status=status or FormStatus.VERIFIED,
         date_from=date_from,
         date_to=date_to,
     )
 
-    if status is None:
-        query = query.filter(AdmissionForm.status == FormStatus.VERIFIED)
-    
-    forms = query.order_by(AdmissionForm.upload_date.desc(), AdmissionForm.id.desc()).all()
+    # Stream rows in chunks instead of materialising the whole result set
+    forms = query.order_by(
+        AdmissionForm.upload_date.desc(), AdmissionForm.id.desc()
+    ).yield_per(EXPORT_CHUNK_SIZE)
 
     filters_snapshot = {
         "student_name": student_name,
@@ -154,54 +309,79 @@ async def export_forms(
     }
     filters_snapshot = {key: value for key, value in filters_snapshot.items() if value}
 
-    logger.info(
-        "Exporting forms format=%s count=%s filters=%s",
-        format,
-        len(forms),
-        filters_snapshot,
-    )
-    
-    if format == "csv":
-        return export_to_csv(forms)
+    # Only the rows are cached; the JSON envelope (generated_at) is built per request
+    cache_key = _export_cache_key(format, filters_snapshot)
+    chunks: Optional[Iterable[ExportChunk]] = _get_cached_export(cache_key)
+    if chunks is not None:
+        logger.info("Serving cached export format=%s filters=%s", format, filters_snapshot)
     else:
-        return export_to_json(forms, filters_snapshot)
+        logger.info(
+            "Exporting forms format=%s filters=%s",
+            format,
+            filters_snapshot,
+        )
+        rows = csv_export_chunks(forms) if format == "csv" else json_export_rows(forms)
+        chunks = _cache_export_chunks(cache_key, rows)
+    
+    if format == "json":
+        chunks = itertools.chain([json_export_header(filters_snapshot)], chunks)
+    return export_response(format, chunks)
 
-def export_to_csv(forms: Iterable[AdmissionForm]) -> StreamingResponse:
-    """Export forms to CSV format using a streaming response."""
+def export_response(format: str, chunks: Iterable[ExportChunk]) -> StreamingResponse:
+    """Wrap export chunks in a streaming download response."""
+    media_type, filename = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
 
-    def row_iterator():
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow([header for _, header in EXPORT_FIELDS])
-        yield output.getvalue()
-        output.seek(0)
-        output.truncate(0)
+def csv_export_chunks(forms: Iterable[AdmissionForm]) -> Iterator[str]:
+    """Yield the CSV export in batches of CSV_BATCH_SIZE rows."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow([header for _, header in EXPORT_FIELDS])
 
-        for form in forms:
-            writer.writerow(form_to_csv_row(form))
+    count = 0
+    batch: list[list[str]] = []
+    for form in forms:
+        batch.append(form_to_csv_row(form))
+        if len(batch) >= CSV_BATCH_SIZE:
+            writer.writerows(batch)
+            count += len(batch)
+            batch.clear()
             yield output.getvalue()
             output.seek(0)
             output.truncate(0)
 
-    return StreamingResponse(
-        row_iterator(),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=admission_forms.csv"},
-    )
+    writer.writerows(batch)
+    count += len(batch)
+    yield output.getvalue()
 
-def export_to_json(forms: Iterable[AdmissionForm], filters: Dict[str, Any]) -> Response:
-    """Export forms to JSON format."""
-    forms_list = list(forms)
-    payload = {
-        "generated_at": datetime.utcnow().isoformat(),
-        "count": len(forms_list),
+    logger.info("Exported %s forms as csv", count)
+
+def json_export_chunks(forms: Iterable[AdmissionForm], filters: Dict[str, Any]) -> Iterator[bytes]:
+    """Yield the JSON export document piece by piece, one form at a time."""
+    yield json_export_header(filters)
+    yield from json_export_rows(forms)
+
+def json_export_header(filters: Dict[str, Any]) -> bytes:
+    """Opening of the JSON export document, up to the start of the forms array."""
+    header = {
+        "generated_at": datetime.utcnow(),
         "filters": filters,
-        "forms": [form_to_json_dict(form) for form in forms_list],
     }
+    # Reopen the header object so the forms array can be streamed into it
+    return orjson.dumps(header)[:-1] + b', "forms": ['
 
-    return Response(
-        content=json.dumps(payload, indent=2, ensure_ascii=False),
-        media_type="application/json",
-        headers={"Content-Disposition": "attachment; filename=admission_forms.json"},
-    )
+def json_export_rows(forms: Iterable[AdmissionForm]) -> Iterator[bytes]:
+    """Yield the forms array entries and the closing count of the JSON export."""
+    count = 0
+    for form in forms:
+        if count:
+            yield b", "
+        yield orjson.dumps(form_to_json_dict(form), option=orjson.OPT_NON_STR_KEYS)
+        count += 1
 
+    yield b'], "count": %d}' % count
+    logger.info("Exported %s forms as json", count)
@@ -1,70 +1,143 @@
 """
 File serving routes for previews
 """
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session, raiseload
 from backend.database import get_db, AdmissionForm
-from backend.utils.file_handler import load_image
+from backend.utils.file_handler import (
+    load_image,
+    load_pdf_page,
+    get_pdf_page_count,
+    get_page_count,
+    get_file_extension,
+    resolve_upload_path,
+)
+from backend.utils.http_cache import etag_matches
+from backend.ocr.page_runner import run_in_ocr_pool
 from backend.config import settings
 from pathlib import Path
-import io
-from PIL import Image
+import asyncio
+import hashlib
+import os
+import uuid
 
 router = APIRouter()
 
+PREVIEW_CACHE_DIR = Path(settings.PREVIEW_CACHE_DIR)
+# Uploads browsers display natively are served as-is instead of re-encoded
+DIRECT_PREVIEW_TYPES = {"jpg": "image/jpeg", "jpeg": "image/jpeg", "png": "image/png"}
+
+def _render_preview(source_path: str, page: int, is_pdf: bool, cache_path: str) -> None:
+    """Render one page of a form to a JPEG in the preview cache (runs in a worker process)."""
+    if is_pdf:
+        # Rasterize only the requested page (1-indexed)
+        image = load_pdf_page(source_path, page)
+    else:
+        image = load_image(source_path)
+    
+    # Convert to RGB if needed
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    
+    # Save as JPEG with high quality; write then rename so readers never see partial files.
+    # No optimize=True: the extra Huffman pass costs more encode time than the bytes it saves
+    tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+    image.save(tmp_path, format='JPEG', quality=95)
+    os.replace(tmp_path, cache_path)
+
+def _preview_cache_path(form_id: int, page: int, source_stat: os.stat_result) -> Path:
+    """Cache location for a rendered preview; changes whenever the source file does."""
+    mtime = int(source_stat.st_mtime)
+    return PREVIEW_CACHE_DIR / f"{form_id}_{page}_{mtime}.jpg"
+
+def _prune_preview_cache() -> None:
+    """Drop least recently used previews once the cache exceeds its size limit."""
+    entries = list(PREVIEW_CACHE_DIR.glob("*.jpg"))
+    excess = len(entries) - settings.PREVIEW_CACHE_MAX_FILES
+    if excess <= 0:
+        return
+    mtimes = {}
+    for entry in entries:
+        try:
+            mtimes[entry] = entry.stat().st_mtime
+        except FileNotFoundError:
+            # Already removed by a concurrent prune
+            excess -= 1
+    for entry in sorted(mtimes, key=mtimes.get)[:max(excess, 0)]:
+        entry.unlink(missing_ok=True)
+
 @router.get("/preview/{form_id}")
-async def get_form_preview(form_id: int, page: int = 1, db: Session = Depends(get_db)):
+async def get_form_preview(form_id: int, request: Request, page: int = 1, db: Session = Depends(get_db)):
     """
     Get form preview as image (converts PDF to image if needed)
     For PDFs, use ?page=1, ?page=2, etc. to view specific pages
     """
-    form = db.query(AdmissionForm).filter(AdmissionForm.id == form_id).first()
+    form = db.query(AdmissionForm).options(raiseload('*')).filter(AdmissionForm.id == form_id).first()
     if not form:
         raise HTTPException(status_code=404, detail="Form not found")
     
     try:
-        # Construct full path
-        upload_dir = Path(settings.UPLOAD_DIR).resolve()
-        full_file_path = upload_dir / form.file_path
-        
-        if not full_file_path.exists():
+        # Construct full path; one stat serves the existence check, ETag and cache key
+        try:
+            full_file_path = resolve_upload_path(form.file_path)
+            source_stat = full_file_path.stat()
+        except (ValueError, FileNotFoundError):
             raise HTTPException(status_code=404, detail="File not found")
         
+        # Revalidation: the rendered page only changes when the source file does
+        etag_base = f"{form_id}:{page}:{source_stat.st_mtime_ns}"
+        etag = f'"{hashlib.md5(etag_base.encode()).hexdigest()}"'
+        cache_headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=cache_headers)
+        
         # Check if it's a PDF
-        from backend.utils.file_handler import get_file_extension, load_all_pdf_pages
         file_ext = get_file_extension(str(full_file_path))
+        is_pdf = file_ext == 'pdf'
         
-        if file_ext == 'pdf':
-            # Load all pages
-            pages = load_all_pdf_pages(str(full_file_path))
-            
+        if is_pdf:
             # Validate page number
-            if page < 1 or page > len(pages):
-                raise HTTPException(status_code=400, detail=f"Page {page} not found. PDF has {len(pages)} pages.")
-            
-            # Get requested page (1-indexed)
-            image = pages[page - 1]
+            # Opening the PDF for its page count blocks, so older rows read it on a thread
+            total_pages = form.total_pages or await asyncio.to_thread(
+                get_pdf_page_count, str(full_file_path)
+            )
+            if page < 1 or page > total_pages:
+                raise HTTPException(status_code=400, detail=f"Page {page} not found. PDF has {total_pages} pages.")
         else:
-            # Single image file
-            image = load_image(str(full_file_path))
+            media_type = DIRECT_PREVIEW_TYPES.get(file_ext)
+            if media_type:
+                return FileResponse(
+                    full_file_path,
+                    media_type=media_type,
+                    headers=cache_headers,
+                    stat_result=source_stat,
+                )
+            # Single image file that needs converting (TIFF, BMP)
+            page = 1
         
-        # Convert to JPEG for web display
-        img_byte_arr = io.BytesIO()
-        # Convert to RGB if needed
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
+        cache_path = _preview_cache_path(form_id, page, source_stat)
+        try:
+            # Refresh mtime so pruning evicts least recently used entries
+            os.utime(cache_path)
+            content = await asyncio.to_thread(cache_path.read_bytes)
+        except FileNotFoundError:
+            # Not cached yet, or pruned by a concurrent request since; render it again.
+            # Rendering and JPEG encoding are CPU-bound; they share the OCR process pool
+            # so previews and OCR together stay within its worker count
+            PREVIEW_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            await run_in_ocr_pool(
+                _render_preview, str(full_file_path), page, is_pdf, str(cache_path)
+            )
+            # Read before pruning so the bytes served cannot be unlinked underneath us
+            content = await asyncio.to_thread(cache_path.read_bytes)
+            # Globbing and stat'ing the whole cache directory blocks; keep it off the event loop
+            await asyncio.to_thread(_prune_preview_cache)
         
-        # Save as JPEG with high quality
-        image.save(img_byte_arr, format='JPEG', quality=95, optimize=True)
-        img_byte_arr.seek(0)
-        
-        return StreamingResponse(
-            img_byte_arr,
+        return Response(
+            content=content,
             media_type="image/jpeg",
-            headers={
-                "Cache-Control": "public, max-age=3600"
-            }
+            headers=cache_headers,
         )
         
     except HTTPException:
@@ -73,27 +146,29 @@ async def get_form_preview(form_id: int, page: int = 1, db: Session = Depends(ge
         raise HTTPException(status_code=500, detail=f"Failed to generate preview: {str(e)}")
 
 @router.get("/preview/{form_id}/pages")
-async def get_form_pages_info(form_id: int, db: Session = Depends(get_db)):
+def get_form_pages_info(form_id: int, db: Session = Depends(get_db)):
     """
     Get information about PDF pages (number of pages)
     """
-    form = db.query(AdmissionForm).filter(AdmissionForm.id == form_id).first()
-    if not form:
+    row = db.query(AdmissionForm.file_path, AdmissionForm.total_pages).filter(
+        AdmissionForm.id == form_id
+    ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Form not found")
     
+    file_path, total_pages = row
+    is_pdf = get_file_extension(file_path) == 'pdf'
+    if total_pages is not None:
+        return {"total_pages": total_pages, "is_pdf": is_pdf}
+    
     try:
-        from backend.utils.file_handler import get_file_extension, load_all_pdf_pages
-        from pathlib import Path
-        upload_dir = Path(settings.UPLOAD_DIR).resolve()
-        full_file_path = upload_dir / form.file_path
-        
-        file_ext = get_file_extension(str(full_file_path))
-        
-        if file_ext == 'pdf':
-            pages = load_all_pdf_pages(str(full_file_path))
-            return {"total_pages": len(pages), "is_pdf": True}
-        else:
-            return {"total_pages": 1, "is_pdf": False}
+        # Older rows predate the stored count; read it from the PDF metadata once and keep it
+        total_pages = get_page_count(str(resolve_upload_path(file_path)))
+        db.query(AdmissionForm).filter(AdmissionForm.id == form_id).update(
+            {AdmissionForm.total_pages: total_pages}, synchronize_session=False
+        )
+        db.commit()
+        return {"total_pages": total_pages, "is_pdf": is_pdf}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get page info: {str(e)}")
 
@@ -1,25 +1,99 @@
 import logging
+import threading
+from collections import OrderedDict
 
-from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy.orm import Session
-from typing import Optional, List, Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, tuple_, update
+from sqlalchemy.orm import Session, joinedload, raiseload
+from starlette.concurrency import run_in_threadpool
+from typing import Optional, List, Dict, Any, AsyncIterator
+from pydantic import TypeAdapter
 from datetime import datetime, timedelta
+from urllib.parse import urlencode
+import orjson
 from backend.database import get_db, AdmissionForm, FormStatus, StudentDocument
 from backend.models.form import (
     FormDetailResponse,
+    FormListItemResponse,
     FormVerification,
     FormSearchParams,
     FormExtractionResponse,
     ExtractedData,
+    StudentFields,
 )
 from backend.api.routes.students import get_or_create_student_profile
 from backend.ocr import get_ocr_provider
-from backend.utils.file_handler import load_image
+from backend.ocr.multi_provider import get_multi_provider_ocr
+from backend.ocr.page_runner import (
+    NumberedOutcome,
+    can_extract_whole_pdf,
+    combine_page_outcomes,
+    extract_image,
+    extract_image_with_tesseract,
+    extract_whole_pdf,
+    iter_pdf_page_results,
+    iter_tesseract_pdf_page_results,
+    page_summary,
+    retry_rate_limited,
+)
+from backend.utils.file_handler import (
+    get_file_extension,
+    get_pdf_page_count,
+    load_image,
+    resolve_upload_path,
+)
+from backend.utils.form_parser import is_srcc_filename, parse_form_text
+from backend.utils.http_cache import etag_matches
 from backend.config import settings
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Form details kept in memory; each entry is revalidated by the version probe
+FORM_DETAIL_CACHE_MAX_ENTRIES = 256
+
+# Validates a page of forms in one pass
+FORM_LIST_ADAPTER = TypeAdapter(List[FormListItemResponse])
+# Lists fetch only the columns they return; no ORM instances or documents are loaded
+FORM_LIST_COLUMNS = tuple(getattr(AdmissionForm, field) for field in FormListItemResponse.model_fields)
+
+# Student detail columns filled by OCR auto-fill, verification and manual updates
+FORM_DETAIL_FIELDS: tuple[str, ...] = tuple(
+    field for field in StudentFields.model_fields if field != 'additional_info'
+)
+
+def autofill_values(structured_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Form columns to fill from parsed OCR data (fields the parser found a value for)."""
+    return {
+        field: structured_data[field]
+        for field in FORM_DETAIL_FIELDS
+        if structured_data.get(field)
+    }
+
+
+# Serialised form details keyed by form id and tagged with the version (ETag) they
+# were built from; a version mismatch means the form or its documents changed
+_form_detail_cache: "OrderedDict[int, tuple[str, FormDetailResponse]]" = OrderedDict()
+_form_detail_cache_lock = threading.Lock()
+
+
+def _get_cached_form_detail(form_id: int, version: str) -> Optional[FormDetailResponse]:
+    with _form_detail_cache_lock:
+        entry = _form_detail_cache.get(form_id)
+        if entry is None or entry[0] != version:
+            return None
+        _form_detail_cache.move_to_end(form_id)
+        return entry[1]
+
+
+def _cache_form_detail(form_id: int, version: str, form_data: FormDetailResponse) -> None:
+    with _form_detail_cache_lock:
+        _form_detail_cache[form_id] = (version, form_data)
+        _form_detail_cache.move_to_end(form_id)
+        while len(_form_detail_cache) > FORM_DETAIL_CACHE_MAX_ENTRIES:
+            _form_detail_cache.popitem(last=False)
+
 
 def apply_form_filters(
     query,
@@ -59,52 +133,145 @@ def apply_form_filters(
 
     return query
 
-@router.get("/", response_model=List[FormDetailResponse])
-async def list_forms(
+def fetch_offset_page(query, skip: int, limit: int, response: Response, include_total: bool) -> list:
+    """
+    Fetch one page of an ordered query. With include_total, the number of
+    matches comes back in the same round-trip (COUNT(*) OVER ()) and is
+    reported in the X-Total-Count header.
+    """
+    if not include_total:
+        return query.offset(skip).limit(limit).all()
+    
+    rows = query.add_columns(func.count().over().label("total")).offset(skip).limit(limit).all()
+    if rows:
+        total = rows[0].total
+    else:
+        # Past the last page there are no rows to carry the window count
+        total = query.order_by(None).count() if skip else 0
+    response.headers["X-Total-Count"] = str(total)
+    return rows
+
+@router.get("/", response_model=List[FormListItemResponse])
+def list_forms(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=1000),
     status: Optional[FormStatus] = None,
+    include_total: bool = Query(False),
     db: Session = Depends(get_db)
 ):
-    """List all admission forms with pagination"""
-    query = db.query(AdmissionForm)
+    """
+    List all admission forms with pagination.
+    Pass include_total=true to get the number of matching forms in X-Total-Count.
+    """
+    query = db.query(*FORM_LIST_COLUMNS)
     
     if status:
         query = query.filter(AdmissionForm.status == status)
     
-    forms = query.order_by(AdmissionForm.upload_date.desc()).offset(skip).limit(limit).all()
-    
-    # Include documents for each form
-    from backend.models.document import DocumentResponse
-    result = []
-    for form in forms:
-        form_data = FormDetailResponse.model_validate(form)
-        documents = db.query(StudentDocument).filter(
-            StudentDocument.form_id == form.id
-        ).all()
-        form_data.documents = [DocumentResponse.model_validate(doc) for doc in documents]
-        result.append(form_data)
+    forms = fetch_offset_page(
+        query.order_by(AdmissionForm.upload_date.desc()), skip, limit, response, include_total
+    )
     
-    return result
+    return FORM_LIST_ADAPTER.validate_python(forms, from_attributes=True)
 
 @router.get("/{form_id}", response_model=FormDetailResponse)
-async def get_form(form_id: int, db: Session = Depends(get_db)):
+def get_form(form_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get detailed information about a specific form"""
-    form = db.query(AdmissionForm).filter(AdmissionForm.id == form_id).first()
-    if not form:
+    # Cheap version probe: form update time plus the shape of its document set. Adding or
+    # deleting a document bumps updated_at, since SQLite may reuse a deleted document's id
+    version = db.query(
+        AdmissionForm.updated_at,
+        AdmissionForm.upload_date,
+        func.count(StudentDocument.id),
+        func.max(StudentDocument.id),
+    ).outerjoin(StudentDocument, StudentDocument.form_id == AdmissionForm.id).filter(
+        AdmissionForm.id == form_id
+    ).group_by(AdmissionForm.id).first()
+    if not version:
         raise HTTPException(status_code=404, detail="Form not found")
     
-    # Get associated documents
-    documents = db.query(StudentDocument).filter(
-        StudentDocument.form_id == form_id
-    ).order_by(StudentDocument.upload_date.desc()).all()
+    updated_at, upload_date, document_count, last_document_id = version
+    changed_at = updated_at or upload_date
+    stamp = int(changed_at.timestamp() * 1_000_000)
+    etag = f'W/"{form_id}-{stamp}-{document_count}-{last_document_id or 0}"'
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    cached = _get_cached_form_detail(form_id, etag)
+    if cached is not None:
+        return cached
+    
+    # The form and its documents come back in a single joined query
+    form = db.query(AdmissionForm).options(
+        joinedload(AdmissionForm.documents), raiseload('*')
+    ).filter(AdmissionForm.id == form_id).first()
+    if not form:
+        raise HTTPException(status_code=404, detail="Form not found")
     
-    from backend.models.document import DocumentResponse
     form_data = FormDetailResponse.model_validate(form)
-    form_data.documents = [DocumentResponse.model_validate(doc) for doc in documents]
-    
+    _cache_form_detail(form_id, etag, form_data)
     return form_data
 
+def _single_image_result(ocr_result: Dict[str, Any], provider_name: str) -> Dict[str, Any]:
+    """Fill in the multi-page fields for a single-image extraction result."""
+    selected_provider = provider_name
+    if provider_name == "best":
+        selected_provider = ocr_result.get('provider_used', 'multi')
+    ocr_result.setdefault("pages_processed", 1)
+    ocr_result.setdefault(
+        "page_results",
+        [
+            {
+                "page": 1,
+                "raw_text": ocr_result.get("raw_text", ""),
+                "confidence": ocr_result.get("confidence"),
+                "provider": ocr_result.get("provider", selected_provider),
+            }
+        ],
+    )
+    ocr_result.setdefault("provider", selected_provider)
+    return ocr_result
+
+def save_extraction(db: Session, form_id: int, ocr_result: Dict[str, Any], is_srcc_form: bool) -> None:
+    """Auto-fill SRCC fields and store the extraction result on the form."""
+    # Parse structured data from OCR text for SRCC forms (other forms skip the parser)
+    changes: Dict[str, Any] = {}
+    if is_srcc_form and ocr_result.get('raw_text'):
+        structured_data = parse_form_text(ocr_result['raw_text'], form_type='srcc')
+        ocr_result['structured_data'] = structured_data
+        # Auto-fill all form fields if available
+        changes = autofill_values(structured_data)
+    
+    # Write the auto-filled fields and extraction result in one UPDATE
+    changes.update(
+        extracted_data=ocr_result,
+        ocr_provider=ocr_result["provider"],
+        status=FormStatus.EXTRACTED,
+    )
+    db.execute(update(AdmissionForm).where(AdmissionForm.id == form_id).values(**changes))
+    db.commit()
+
+    logger.info(
+        "Re-extracted form %s with provider %s (pages=%s, confidence=%s)",
+        form_id,
+        ocr_result["provider"],
+        ocr_result.get("pages_processed"),
+        ocr_result.get("confidence"),
+    )
+
+def mark_extraction_failed(db: Session, form_id: int, provider_name: str) -> None:
+    # Discard anything half-written, then flag the form in a single UPDATE
+    db.rollback()
+    db.execute(
+        update(AdmissionForm).where(AdmissionForm.id == form_id).values(status=FormStatus.ERROR)
+    )
+    db.commit()
+    logger.exception(
+        "Re-extraction failed for form %s with provider %s", form_id, provider_name
+    )
+
 @router.post(
     "/{form_id}/extract",
     response_model=FormExtractionResponse,
@@ -113,149 +280,113 @@ async def get_form(form_id: int, db: Session = Depends(get_db)):
 async def re_extract_form(
     form_id: int,
     ocr_provider: Optional[str] = None,
+    stream: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Re-extract text from a form using a different or same OCR provider"""
-    form = db.query(AdmissionForm).filter(AdmissionForm.id == form_id).first()
+    """
+    Re-extract text from a form using a different or same OCR provider.
+    With stream=true the response is NDJSON: one line per page as it finishes
+    (in completion order), then a final line with the FormExtractionResponse
+    body, or {"detail": ...} if the extraction failed.
+    """
+    form = db.query(AdmissionForm).options(raiseload('*')).filter(AdmissionForm.id == form_id).first()
     if not form:
         raise HTTPException(status_code=404, detail="Form not found")
     
+    # Reject stored paths that escape the upload directory before any OCR setup
     try:
-        provider_name = (ocr_provider or form.ocr_provider or settings.OCR_PROVIDER).lower()
-        if provider_name == "multi":
-            provider_name = "best"
-
-        provider = None
-        multi_ocr = None
+        full_file_path = resolve_upload_path(form.file_path)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid form file path")
+    is_srcc_form = is_srcc_filename(form.filename)
+    total_pages = form.total_pages
+    
+    provider_name = (ocr_provider or form.ocr_provider or settings.OCR_PROVIDER).lower()
+    if provider_name == "multi":
+        provider_name = "best"
+    
+    async def extract_page(page_image):
+        # Retries sleep inside the page's concurrency slot, so they never add load
+        # (MultiProviderOCR retries each of its providers itself)
+        if provider_name == "best":
+            return await get_multi_provider_ocr().extract_with_best_provider(page_image)
+        return await retry_rate_limited(lambda: get_ocr_provider(provider_name).extract_text(page_image))
+    
+    async def iter_page_outcomes() -> AsyncIterator[NumberedOutcome]:
+        """Yield (page number, result) for each page as it finishes."""
         if provider_name == "best":
-            from backend.ocr.multi_provider import MultiProviderOCR
-            multi_ocr = MultiProviderOCR()
+            get_multi_provider_ocr()
         else:
-            provider = get_ocr_provider(provider_name)
-
-        selected_provider = provider_name
-
-        # Construct full path from relative path
-        import os
-        from pathlib import Path
-        from backend.utils.file_handler import load_all_pdf_pages, get_file_extension
-        upload_dir = Path(settings.UPLOAD_DIR).resolve()
-        full_file_path = upload_dir / form.file_path
-        
-        # Check if it's a PDF - process all pages
-        file_ext = get_file_extension(str(full_file_path))
-        is_pdf = file_ext == 'pdf'
+            # Fail fast on unknown or unconfigured providers
+            get_ocr_provider(provider_name)
         
-        if is_pdf:
-            # Load all pages from PDF
-            pages = load_all_pdf_pages(str(full_file_path))
-            
-            # Process each page with OCR and combine results
-            all_raw_text = []
-            all_confidences = []
-            page_results = []
-            
-            for page_index, page_image in enumerate(pages, start=1):
-                try:
-                    # Use enhanced OCR extraction with preprocessing for Tesseract
-                    if provider_name == "best":
-                        page_result = await multi_ocr.extract_with_best_provider(page_image)
-                        if page_index == 1:
-                            selected_provider = page_result.get('provider_used', 'multi')
-                    elif provider_name == "tesseract":
-                        page_result = await provider.extract_text(page_image, preprocess=True)
-                    else:
-                        page_result = await provider.extract_text(page_image)
-                    
-                    # Collect text and confidence from each page
-                    if page_result.get('raw_text'):
-                        all_raw_text.append(f"\n--- Page {page_index} ---\n{page_result['raw_text']}")
-                        if page_result.get('confidence'):
-                            all_confidences.append(page_result['confidence'])
-                    
-                    page_results.append({
-                        'page': page_index,
-                        'raw_text': page_result.get('raw_text', ''),
-                        'confidence': page_result.get('confidence', 0.0),
-                        'provider': page_result.get('provider_used', selected_provider)
-                    })
-                    
-                except Exception as page_error:
-                    # Continue with other pages if one fails
-                    print(f"Error processing page {page_index}: {str(page_error)}")
-                    continue
-            
-            # Combine all pages' text
-            combined_text = "\n".join(all_raw_text)
-            avg_confidence = sum(all_confidences) / len(all_confidences) if all_confidences else 0.0
-            
-            ocr_result: Dict[str, Any] = {
-                "raw_text": combined_text,
-                "confidence": round(avg_confidence, 2),
-                "structured_data": None,
-                "provider": selected_provider,
-                "pages_processed": len(pages),
-                "page_results": page_results
-            }
-        else:
-            # Single image file - process normally
-            image = load_image(str(full_file_path))
-            
-            # Use enhanced OCR extraction with preprocessing for Tesseract
-            if provider_name == "best":
-                ocr_result = await multi_ocr.extract_with_best_provider(image)
-                selected_provider = ocr_result.get('provider_used', 'multi')
-            elif provider_name == "tesseract":
-                ocr_result = await provider.extract_text(image, preprocess=True)
-            else:
-                ocr_result = await provider.extract_text(image)
-            ocr_result.setdefault("pages_processed", 1)
-            ocr_result.setdefault(
-                "page_results",
-                [
-                    {
-                        "page": 1,
-                        "raw_text": ocr_result.get("raw_text", ""),
-                        "confidence": ocr_result.get("confidence"),
-                        "provider": ocr_result.get("provider", selected_provider),
-                    }
-                ],
+        if get_file_extension(str(full_file_path)) == 'pdf':
+            page_count = total_pages or await run_in_threadpool(
+                get_pdf_page_count, str(full_file_path)
             )
-            ocr_result.setdefault("provider", selected_provider)
+            if provider_name == "tesseract":
+                # Local, CPU-bound OCR (with preprocessing): pool workers render and
+                # OCR their own pages, off the event loop
+                pages = iter_tesseract_pdf_page_results(str(full_file_path), page_count)
+            elif provider_name != "best" and can_extract_whole_pdf(
+                provider := get_ocr_provider(provider_name), page_count
+            ):
+                # One request for the whole document instead of one per page
+                page_results = await extract_whole_pdf(provider, str(full_file_path))
+                for page_number, page_result in enumerate(page_results, start=1):
+                    yield page_number, page_result
+                return
+            else:
+                pages = iter_pdf_page_results(str(full_file_path), extract_page)
+            async for outcome in pages:
+                yield outcome
+            return
         
-        # Parse structured data from OCR text for SRCC forms
-        if ocr_result.get('raw_text'):
-            from backend.utils.form_parser import parse_form_text
-            is_srcc_form = 'srcc' in (form.filename or '').lower() or 'data form' in (form.filename or '').lower()
-            if is_srcc_form:
-                structured_data = parse_form_text(ocr_result['raw_text'], form_type='srcc')
-                ocr_result['structured_data'] = structured_data
-                # Auto-fill all form fields if available
-                for field in ['student_name', 'date_of_birth', 'gender', 'category', 'nationality', 
-                             'religion', 'aadhar_number', 'blood_group', 'permanent_address', 
-                             'correspondence_address', 'pincode', 'city', 'state', 'phone_number', 
-                             'alternate_phone', 'email', 'emergency_contact_name', 'emergency_contact_phone',
-                             'father_name', 'father_occupation', 'father_phone', 'mother_name', 
-                             'mother_occupation', 'mother_phone', 'guardian_name', 'guardian_relation', 
-                             'guardian_phone', 'annual_income', 'tenth_board', 'tenth_year', 
-                             'tenth_percentage', 'tenth_school', 'twelfth_board', 'twelfth_year', 
-                             'twelfth_percentage', 'twelfth_school', 'previous_qualification', 
-                             'graduation_details', 'course_applied', 'application_number', 'enrollment_number', 'admission_date']:
-                    if structured_data.get(field):
-                        setattr(form, field, structured_data[field])
+        # Single image file - process normally
+        image = await run_in_threadpool(load_image, str(full_file_path))
         
-        form.extracted_data = ocr_result
-        form.ocr_provider = selected_provider
-        form.status = FormStatus.EXTRACTED
-        db.commit()
-
-        logger.info(
-            "Re-extracted form %s with provider %s (pages=%s, confidence=%s)",
-            form_id,
-            selected_provider,
-            ocr_result.get("pages_processed"),
-            ocr_result.get("confidence"),
-        )
+        # Use enhanced OCR extraction with preprocessing for Tesseract; provider
+        # SDK calls block, so neither runs on the event loop
+        if provider_name == "tesseract":
+            yield 0, await extract_image_with_tesseract(image)
+        else:
+            yield 0, await extract_image(extract_page, image)
+    
+    def build_result(page_outcomes: Dict[int, Any]) -> Dict[str, Any]:
+        if 0 in page_outcomes:
+            # Page 0 marks a single image; its result is kept as the provider returned it
+            return _single_image_result(page_outcomes[0], provider_name)
+        return combine_page_outcomes(sorted(page_outcomes.items()), provider_name)
+    
+    if stream:
+        async def stream_extraction() -> AsyncIterator[bytes]:
+            page_outcomes: Dict[int, Any] = {}
+            try:
+                async for page_index, page_result in iter_page_outcomes():
+                    if isinstance(page_result, BaseException):
+                        line = {"page": page_index, "error": str(page_result)}
+                    else:
+                        line = page_summary(page_index or 1, page_result, provider_name)
+                    page_outcomes[page_index] = page_result
+                    yield orjson.dumps(line) + b"\n"
+                
+                ocr_result = build_result(page_outcomes)
+                save_extraction(db, form_id, ocr_result, is_srcc_form)
+                body = FormExtractionResponse(
+                    message="Re-extraction completed",
+                    result=ExtractedData(**ocr_result),
+                )
+                yield orjson.dumps(body.model_dump(mode="json")) + b"\n"
+            except Exception as e:
+                mark_extraction_failed(db, form_id, provider_name)
+                yield orjson.dumps({"detail": f"Re-extraction failed: {str(e)}"}) + b"\n"
+        
+        return StreamingResponse(stream_extraction(), media_type="application/x-ndjson")
+    
+    try:
+        page_outcomes = {page_index: page_result async for page_index, page_result in iter_page_outcomes()}
+        ocr_result = build_result(page_outcomes)
+        save_extraction(db, form_id, ocr_result, is_srcc_form)
         
         return FormExtractionResponse(
             message="Re-extraction completed",
@@ -263,57 +394,16 @@ async def re_extract_form(
         )
         
     except Exception as e:
-        form.status = FormStatus.ERROR
-        db.commit()
-        logger.exception(
-            "Re-extraction failed for form %s with provider %s", form_id, provider_name
-        )
+        mark_extraction_failed(db, form_id, provider_name)
         raise HTTPException(status_code=500, detail=f"Re-extraction failed: {str(e)}")
 
 @router.put("/{form_id}/verify", response_model=FormDetailResponse)
-async def verify_form(
+def verify_form(
     form_id: int,
     verification: FormVerification,
     db: Session = Depends(get_db)
 ):
     """Save verified/corrected student information"""
-    form = db.query(AdmissionForm).filter(AdmissionForm.id == form_id).first()
-    if not form:
-        raise HTTPException(status_code=404, detail="Form not found")
-    
-    # Update form with verified data - all fields
-    # Basic Details
-    for field in ['student_name', 'date_of_birth', 'gender', 'category', 'nationality', 
-                  'religion', 'aadhar_number', 'blood_group']:
-        setattr(form, field, getattr(verification, field, None))
-    
-    # Address Details
-    for field in ['permanent_address', 'correspondence_address', 'pincode', 'city', 'state']:
-        setattr(form, field, getattr(verification, field, None))
-    
-    # Contact Details
-    for field in ['phone_number', 'alternate_phone', 'email', 'emergency_contact_name', 
-                 'emergency_contact_phone']:
-        setattr(form, field, getattr(verification, field, None))
-    
-    # Guardian/Parent Details
-    for field in ['father_name', 'father_occupation', 'father_phone', 'mother_name', 
-                 'mother_occupation', 'mother_phone', 'guardian_name', 'guardian_relation', 
-                 'guardian_phone', 'annual_income']:
-        setattr(form, field, getattr(verification, field, None))
-    
-    # Educational Qualifications
-    for field in ['tenth_board', 'tenth_year', 'tenth_percentage', 'tenth_school',
-                 'twelfth_board', 'twelfth_year', 'twelfth_percentage', 'twelfth_school',
-                 'previous_qualification', 'graduation_details']:
-        setattr(form, field, getattr(verification, field, None))
-    
-    # Course Application Details
-    for field in ['course_applied', 'application_number', 'enrollment_number', 'admission_date']:
-        setattr(form, field, getattr(verification, field, None))
-    
-    form.additional_info = verification.additional_info
-    
     # Validate required field: student_name
     if not verification.student_name or not verification.student_name.strip():
         raise HTTPException(
@@ -321,80 +411,76 @@ async def verify_form(
             detail="Student name is required. A form cannot be verified without a student name."
         )
     
-    # Only mark as verified if student_name is provided
-    form.status = FormStatus.VERIFIED
-    form.verified_date = datetime.utcnow()
+    # Update form with verified data - all fields (FormVerification mirrors the
+    # detail columns plus additional_info, so one model_dump builds the SET list)
+    values: Dict[str, Any] = verification.model_dump()
+    values["status"] = FormStatus.VERIFIED
+    values["verified_date"] = datetime.utcnow()
     
-    # Auto-link to student profile if student_name is provided
-    if verification.student_name:
-        try:
-            profile = get_or_create_student_profile(
-                db,
-                verification.student_name,
-                verification.aadhar_number
-            )
-            form.student_profile_id = profile.id
-        except Exception as e:
-            # Log error but don't fail the verification
-            print(f"Warning: Could not link form to student profile: {e}")
-    
-    db.commit()
-    db.refresh(form)
-    
-    # Get associated documents
-    documents = db.query(StudentDocument).filter(
-        StudentDocument.form_id == form.id
-    ).order_by(StudentDocument.upload_date.desc()).all()
+    # Auto-link to student profile (flushed only; rolled back if the form is missing)
+    try:
+        profile = get_or_create_student_profile(
+            db,
+            verification.student_name,
+            verification.aadhar_number
+        )
+        values["student_profile_id"] = profile.id
+    except Exception as e:
+        # Log error but don't fail the verification
+        db.rollback()
+        print(f"Warning: Could not link form to student profile: {e}")
+    
+    # UPDATE ... RETURNING hands back the updated row, so no refresh is needed
+    form = db.execute(
+        update(AdmissionForm)
+        .where(AdmissionForm.id == form_id)
+        .values(**values)
+        .returning(AdmissionForm)
+    ).scalar_one_or_none()
+    if not form:
+        raise HTTPException(status_code=404, detail="Form not found")
     
-    from backend.models.document import DocumentResponse
+    # Associated documents are loaded through the relationship
     form_data = FormDetailResponse.model_validate(form)
-    form_data.documents = [DocumentResponse.model_validate(doc) for doc in documents]
     
+    db.commit()
     return form_data
 
 @router.put("/{form_id}", response_model=FormDetailResponse)
-async def update_form(
+def update_form(
     form_id: int,
     verification: FormVerification,
     db: Session = Depends(get_db)
 ):
     """Update form data (without requiring verification status)"""
-    form = db.query(AdmissionForm).filter(AdmissionForm.id == form_id).first()
-    if not form:
-        raise HTTPException(status_code=404, detail="Form not found")
-    
     # Update form with provided data
-    for field in ['student_name', 'date_of_birth', 'gender', 'category', 'nationality',
-                  'religion', 'aadhar_number', 'blood_group',
-                  'permanent_address', 'correspondence_address', 'pincode', 'city', 'state',
-                  'phone_number', 'alternate_phone', 'email', 'emergency_contact_name',
-                  'emergency_contact_phone', 'father_name', 'father_occupation', 'father_phone',
-                  'mother_name', 'mother_occupation', 'mother_phone', 'guardian_name',
-                  'guardian_relation', 'guardian_phone', 'annual_income', 'tenth_board',
-                  'tenth_year', 'tenth_percentage', 'tenth_school', 'twelfth_board',
-                  'twelfth_year', 'twelfth_percentage', 'twelfth_school', 'previous_qualification',
-                  'graduation_details', 'course_applied', 'application_number',
-                  'enrollment_number', 'admission_date']:
-        value = getattr(verification, field, None)
-        if value is not None:
-            setattr(form, field, value)
-
-    if verification.additional_info is not None:
-        form.additional_info = verification.additional_info
+    values: Dict[str, Any] = verification.model_dump(exclude_none=True)
     
     # Update status if student_name is provided (mark as verified)
     if verification.student_name:
-        form.status = FormStatus.VERIFIED
-        if not form.verified_date:
-            form.verified_date = datetime.utcnow()
+        values["status"] = FormStatus.VERIFIED
+        values["verified_date"] = func.coalesce(AdmissionForm.verified_date, datetime.utcnow())
+    
+    if values:
+        # UPDATE ... RETURNING hands back the updated row, so no refresh is needed
+        form = db.execute(
+            update(AdmissionForm)
+            .where(AdmissionForm.id == form_id)
+            .values(**values)
+            .returning(AdmissionForm)
+        ).scalar_one_or_none()
+    else:
+        form = db.query(AdmissionForm).filter(AdmissionForm.id == form_id).first()
+    if not form:
+        raise HTTPException(status_code=404, detail="Form not found")
     
+    form_data = FormDetailResponse.model_validate(form)
     db.commit()
-    db.refresh(form)
-    
-    return FormDetailResponse.model_validate(form)
+    return form_data
 
-@router.get("/search/results", response_model=List[FormDetailResponse])
-async def search_forms(
+@router.get("/search/results", response_model=List[FormListItemResponse])
+def search_forms(
+    response: Response,
     student_name: Optional[str] = Query(None),
     phone_number: Optional[str] = Query(None),
     email: Optional[str] = Query(None),
@@ -406,13 +492,20 @@ async def search_forms(
     date_to: Optional[datetime] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor_upload_date: Optional[datetime] = Query(None),
+    cursor_id: Optional[int] = Query(None),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db)
 ):
-    """Search forms by various criteria including enrollment number"""
-    query = db.query(AdmissionForm)
-    
+    """
+    Search forms by various criteria including enrollment number.
+    Pass cursor_upload_date + cursor_id (from the X-Next-Cursor header of the
+    previous response) to page by keyset instead of page number. Page-number
+    requests with include_total=true also return the number of matches in
+    X-Total-Count.
+    """
     query = apply_form_filters(
-        query,
+        db.query(*FORM_LIST_COLUMNS),
         student_name=student_name,
         phone_number=phone_number,
         email=email,
@@ -424,9 +517,21 @@ async def search_forms(
         date_to=date_to,
     )
     
-    # Pagination
-    skip = (page - 1) * limit
-    forms = query.order_by(AdmissionForm.upload_date.desc(), AdmissionForm.id.desc()).offset(skip).limit(limit).all()
+    ordered = query.order_by(AdmissionForm.upload_date.desc(), AdmissionForm.id.desc())
+    
+    if cursor_upload_date is not None and cursor_id is not None:
+        # Keyset: seek straight past the previous page instead of skipping rows
+        rows = ordered.filter(
+            tuple_(AdmissionForm.upload_date, AdmissionForm.id) < tuple_(cursor_upload_date, cursor_id)
+        ).limit(limit).all()
+    else:
+        rows = fetch_offset_page(ordered, (page - 1) * limit, limit, response, include_total)
+    
+    if len(rows) == limit:
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = urlencode(
+            {"cursor_upload_date": last.upload_date.isoformat(), "cursor_id": last.id}
+        )
 
     filters_snapshot = {
         "student_name": student_name,
@@ -445,38 +550,28 @@ async def search_forms(
         active_filters,
         page,
         limit,
-        len(forms),
+        len(rows),
     )
     
-    # Include documents for each form
-    from backend.models.document import DocumentResponse
-    result = []
-    for form in forms:
-        form_data = FormDetailResponse.model_validate(form)
-        documents = db.query(StudentDocument).filter(
-            StudentDocument.form_id == form.id
-        ).all()
-        form_data.documents = [DocumentResponse.model_validate(doc) for doc in documents]
-        result.append(form_data)
-    
-    return result
+    return FORM_LIST_ADAPTER.validate_python(rows, from_attributes=True)
 
 @router.delete("/{form_id}", status_code=204)
-async def delete_form(form_id: int, db: Session = Depends(get_db)):
+def delete_form(form_id: int, db: Session = Depends(get_db)):
     """Delete a form and its associated file"""
     form = db.query(AdmissionForm).filter(AdmissionForm.id == form_id).first()
     if not form:
         raise HTTPException(status_code=404, detail="Form not found")
     
-    # Delete file if it exists
-    import os
-    from pathlib import Path
-    upload_dir = Path(settings.UPLOAD_DIR).resolve()
-    full_file_path = upload_dir / form.file_path
-    if full_file_path.exists():
-        os.remove(full_file_path)
-    
+    file_path = form.file_path
     db.delete(form)
     db.commit()
+    
+    # Remove the file only once the row is gone, so a failed commit never leaves a
+    # form pointing at a missing file (this handler runs in the threadpool, so the
+    # unlink does not block the event loop)
+    try:
+        resolve_upload_path(file_path).unlink(missing_ok=True)
+    except Exception as e:
+        print(f"Warning: Could not delete file {file_path}: {e}")
     return None
 
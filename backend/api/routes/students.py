@@ -1,8 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session, raiseload, selectinload
+from sqlalchemy import or_, and_, func, select
 from typing import Optional, List
 from backend.database import get_db, StudentProfile, AdmissionForm, StudentDocument
+from backend.models.document import DOCUMENT_LIST_ADAPTER
+from backend.models.form import FORM_DETAIL_LIST_ADAPTER
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -24,6 +26,29 @@ class StudentProfileDetailResponse(StudentProfileResponse):
     forms: List = []
     documents: List = []
 
+# Correlated per-row counts: evaluated only for the rows on the requested page,
+# each served by the student_profile_id index
+PROFILE_FORMS_COUNT = (
+    select(func.count(AdmissionForm.id))
+    .where(AdmissionForm.student_profile_id == StudentProfile.id)
+    .correlate(StudentProfile)
+    .scalar_subquery()
+    .label("forms_count")
+)
+PROFILE_DOCUMENTS_COUNT = (
+    select(func.count(StudentDocument.id))
+    .where(StudentDocument.student_profile_id == StudentProfile.id)
+    .correlate(StudentProfile)
+    .scalar_subquery()
+    .label("documents_count")
+)
+
+def _profile_response(profile: StudentProfile, forms_count: int, documents_count: int) -> StudentProfileResponse:
+    profile_data = StudentProfileResponse.model_validate(profile)
+    profile_data.forms_count = forms_count
+    profile_data.documents_count = documents_count
+    return profile_data
+
 def get_or_create_student_profile(
     db: Session,
     student_name: str,
@@ -32,6 +57,7 @@ def get_or_create_student_profile(
     """
     Get existing student profile or create a new one.
     Uses student_name + aadhar_number as composite identifier.
+    Changes are flushed, not committed; the caller commits them.
     """
     if not student_name:
         raise ValueError("Student name is required")
@@ -53,17 +79,15 @@ def get_or_create_student_profile(
             aadhar_number=aadhar_number
         )
         db.add(profile)
-        db.commit()
-        db.refresh(profile)
     else:
         # Update timestamp
         profile.updated_date = datetime.utcnow()
-        db.commit()
+    db.flush()
     
     return profile
 
 @router.get("/", response_model=List[StudentProfileResponse])
-async def list_student_profiles(
+def list_student_profiles(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     student_name: Optional[str] = Query(None),
@@ -71,7 +95,8 @@ async def list_student_profiles(
     db: Session = Depends(get_db)
 ):
     """List all student profiles with search capability"""
-    query = db.query(StudentProfile)
+    # Counts come back with each row instead of two COUNT queries per profile
+    query = db.query(StudentProfile, PROFILE_FORMS_COUNT, PROFILE_DOCUMENTS_COUNT).options(raiseload('*'))
     
     # Build filters
     filters = []
@@ -83,31 +108,19 @@ async def list_student_profiles(
     if filters:
         query = query.filter(and_(*filters))
     
-    profiles = query.order_by(StudentProfile.updated_date.desc()).offset(skip).limit(limit).all()
-    
-    # Add counts
-    result = []
-    for profile in profiles:
-        profile_data = StudentProfileResponse.model_validate(profile)
-        profile_data.forms_count = db.query(AdmissionForm).filter(
-            AdmissionForm.student_profile_id == profile.id
-        ).count()
-        profile_data.documents_count = db.query(StudentDocument).filter(
-            StudentDocument.student_profile_id == profile.id
-        ).count()
-        result.append(profile_data)
-    
-    return result
+    rows = query.order_by(StudentProfile.updated_date.desc()).offset(skip).limit(limit).all()
+    
+    return [_profile_response(*row) for row in rows]
 
 @router.get("/{profile_id}", response_model=StudentProfileDetailResponse)
-async def get_student_profile(profile_id: int, db: Session = Depends(get_db)):
+def get_student_profile(profile_id: int, db: Session = Depends(get_db)):
     """Get detailed information about a student profile with all forms and documents"""
-    profile = db.query(StudentProfile).filter(StudentProfile.id == profile_id).first()
+    profile = db.query(StudentProfile).options(raiseload('*')).filter(StudentProfile.id == profile_id).first()
     if not profile:
         raise HTTPException(status_code=404, detail="Student profile not found")
     
-    # Get all forms for this student
-    forms = db.query(AdmissionForm).filter(
+    # Get all forms for this student (documents batch-loaded, not one query per form)
+    forms = db.query(AdmissionForm).options(selectinload(AdmissionForm.documents), raiseload('*')).filter(
         AdmissionForm.student_profile_id == profile_id
     ).order_by(AdmissionForm.upload_date.desc()).all()
     
@@ -116,20 +129,22 @@ async def get_student_profile(profile_id: int, db: Session = Depends(get_db)):
         StudentDocument.student_profile_id == profile_id
     ).order_by(StudentDocument.upload_date.desc()).all()
     
-    # Build response
-    from backend.models.form import FormDetailResponse
-    from backend.models.document import DocumentResponse
-    
-    profile_data = StudentProfileDetailResponse.model_validate(profile)
-    profile_data.forms = [FormDetailResponse.model_validate(form) for form in forms]
-    profile_data.documents = [DocumentResponse.model_validate(doc) for doc in documents]
-    profile_data.forms_count = len(forms)
-    profile_data.documents_count = len(documents)
+    # Validate the profile columns only; validating the ORM object as the detail
+    # model would lazy-load profile.forms and profile.documents a second time
+    profile_data = StudentProfileDetailResponse(
+        **StudentProfileResponse.model_validate(profile).model_dump(
+            exclude={"forms_count", "documents_count"}
+        ),
+        forms=FORM_DETAIL_LIST_ADAPTER.validate_python(forms, from_attributes=True),
+        documents=DOCUMENT_LIST_ADAPTER.validate_python(documents, from_attributes=True),
+        forms_count=len(forms),
+        documents_count=len(documents),
+    )
     
     return profile_data
 
 @router.post("/", response_model=StudentProfileResponse, status_code=201)
-async def create_student_profile(
+def create_student_profile(
     student_name: str,
     aadhar_number: Optional[str] = None,
     db: Session = Depends(get_db)
@@ -155,27 +170,28 @@ async def create_student_profile(
         aadhar_number=aadhar_number
     )
     db.add(profile)
+    # Flush assigns the id and defaults; serialise before commit expires the row
+    db.flush()
+    profile_data = StudentProfileResponse.model_validate(profile)
     db.commit()
-    db.refresh(profile)
     
-    return StudentProfileResponse.model_validate(profile)
+    return profile_data
 
 @router.get("/{profile_id}/forms", response_model=List)
-async def get_student_forms(profile_id: int, db: Session = Depends(get_db)):
+def get_student_forms(profile_id: int, db: Session = Depends(get_db)):
     """Get all forms for a student profile"""
     profile = db.query(StudentProfile).filter(StudentProfile.id == profile_id).first()
     if not profile:
         raise HTTPException(status_code=404, detail="Student profile not found")
     
-    forms = db.query(AdmissionForm).filter(
+    forms = db.query(AdmissionForm).options(selectinload(AdmissionForm.documents), raiseload('*')).filter(
         AdmissionForm.student_profile_id == profile_id
     ).order_by(AdmissionForm.upload_date.desc()).all()
     
-    from backend.models.form import FormDetailResponse
-    return [FormDetailResponse.model_validate(form) for form in forms]
+    return FORM_DETAIL_LIST_ADAPTER.validate_python(forms, from_attributes=True)
 
 @router.get("/search/results", response_model=List[StudentProfileResponse])
-async def search_student_profiles(
+def search_student_profiles(
     student_name: Optional[str] = Query(None),
     aadhar_number: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
@@ -183,7 +199,8 @@ async def search_student_profiles(
     db: Session = Depends(get_db)
 ):
     """Search student profiles by various criteria"""
-    query = db.query(StudentProfile)
+    # Counts come back with each row instead of two COUNT queries per profile
+    query = db.query(StudentProfile, PROFILE_FORMS_COUNT, PROFILE_DOCUMENTS_COUNT).options(raiseload('*'))
     
     # Build filters
     filters = []
@@ -197,19 +214,7 @@ async def search_student_profiles(
     
     # Pagination
     skip = (page - 1) * limit
-    profiles = query.order_by(StudentProfile.updated_date.desc()).offset(skip).limit(limit).all()
-    
-    # Add counts
-    result = []
-    for profile in profiles:
-        profile_data = StudentProfileResponse.model_validate(profile)
-        profile_data.forms_count = db.query(AdmissionForm).filter(
-            AdmissionForm.student_profile_id == profile.id
-        ).count()
-        profile_data.documents_count = db.query(StudentDocument).filter(
-            StudentDocument.student_profile_id == profile.id
-        ).count()
-        result.append(profile_data)
-    
-    return result
+    rows = query.order_by(StudentProfile.updated_date.desc()).offset(skip).limit(limit).all()
+    
+    return [_profile_response(*row) for row in rows]
 
@@ -1,196 +1,320 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
-from backend.database import get_db, AdmissionForm, FormStatus
-from backend.utils.file_handler import save_uploaded_file, load_image
-from backend.ocr import get_ocr_provider
+import asyncio
+import hashlib
+import logging
+from operator import itemgetter
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, HTTPException, Depends, Query, Response
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session, raiseload
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, List, Optional, Tuple
+from PIL import Image
+from backend.database import get_db, SessionLocal, AdmissionForm, FormStatus
+from backend.utils.file_handler import (
+    save_uploaded_file,
+    load_image,
+    get_file_extension,
+    get_page_count,
+    link_duplicate_upload,
+    resolve_upload_path,
+)
+from backend.utils.form_parser import is_srcc_filename, parse_form_text
+from backend.ocr import OCRFactory, get_ocr_provider
+from backend.ocr.multi_provider import get_multi_provider_ocr
+from backend.ocr.result_cache import CachedExtraction, cache_ocr_result, get_cached_ocr_result
+from backend.ocr.page_runner import (
+    NumberedOutcome,
+    PageExtractor,
+    can_extract_whole_pdf,
+    combine_page_outcomes,
+    extract_image,
+    extract_image_with_tesseract,
+    extract_pages,
+    extract_pages_with_tesseract,
+    extract_pdf_pages_with_tesseract,
+    extract_whole_pdf,
+    iter_pdf_page_results,
+    render_pdf_pages,
+)
+from backend.api.routes.forms import autofill_values
 from backend.models.form import FormResponse
 from backend.config import settings
-from datetime import datetime
+from datetime import datetime, timedelta
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
-@router.post("/upload", response_model=FormResponse, status_code=201)
+def page_extractor(provider_name: str) -> PageExtractor:
+    """The per-page OCR call for a cloud provider (or "best"), set up once per upload."""
+    if provider_name == "best":
+        return get_multi_provider_ocr().extract_with_best_provider
+    return get_ocr_provider(provider_name).extract_text
+
+def combine_upload_pages(page_outcomes: List[NumberedOutcome], provider_name: str) -> Dict[str, Any]:
+    ocr_result = combine_page_outcomes(page_outcomes, provider_name)
+    if provider_name == "best" and ocr_result["provider"] == "best":
+        # First page failed, so no provider was recorded for it
+        ocr_result["provider"] = "multi"
+    return ocr_result
+
+async def ocr_page_images(pages: List[Image.Image], provider_name: str) -> Dict[str, Any]:
+    """
+    OCR every page of an upload concurrently and combine the results in page order.
+    Tesseract pages run on the OCR process pool; other providers run on worker
+    threads, at most page_concurrency() pages at a time.
+    """
+    if provider_name == "tesseract":
+        page_outcomes = await extract_pages_with_tesseract(pages)
+    else:
+        page_outcomes = await extract_pages(page_extractor(provider_name), pages)
+    return combine_upload_pages(list(enumerate(page_outcomes, start=1)), provider_name)
+
+async def load_upload_pages(file_paths: List[str]) -> List[Image.Image]:
+    """Load the pages of the uploaded files in upload order."""
+    pages = []
+    for file_path in file_paths:
+        # Load image; PDFs render on the OCR pool, images decode on a worker thread
+        if get_file_extension(file_path) == 'pdf':
+            pages.extend(await render_pdf_pages(file_path))
+        else:
+            pages.append(await run_in_threadpool(load_image, file_path))
+    return pages
+
+async def extract_upload(
+    file_path: str, is_pdf: bool, provider_name: str, page_count: int
+) -> Tuple[Dict[str, Any], str]:
+    """
+    OCR a single uploaded file.
+    
+    Returns:
+        Tuple of (ocr_result, name of the provider actually used)
+    """
+    if is_pdf:
+        provider = None if provider_name in ("best", "tesseract") else get_ocr_provider(provider_name)
+        if provider is not None and can_extract_whole_pdf(provider, page_count):
+            # One request for the whole document instead of one per page
+            page_outcomes = list(enumerate(await extract_whole_pdf(provider, file_path), start=1))
+        elif provider_name == "tesseract":
+            # Pool workers render and OCR their own pages in parallel
+            page_outcomes = list(
+                enumerate(await extract_pdf_pages_with_tesseract(file_path, page_count), start=1)
+            )
+        else:
+            # Pages are rendered a batch at a time on a worker thread while the
+            # previous batch is being OCR'd
+            page_outcomes = sorted(
+                [outcome async for outcome in iter_pdf_page_results(file_path, page_extractor(provider_name))],
+                key=itemgetter(0),
+            )
+        ocr_result = combine_upload_pages(page_outcomes, provider_name)
+        return ocr_result, ocr_result["provider"]
+    
+    # Single image file - process normally
+    image = await run_in_threadpool(load_image, file_path)
+    
+    # Use enhanced OCR extraction with preprocessing for Tesseract; provider
+    # SDK calls block, so neither runs on the event loop
+    if provider_name == "tesseract":
+        return await extract_image_with_tesseract(image), provider_name
+    
+    ocr_result = await extract_image(page_extractor(provider_name), image)
+    if provider_name == "best":
+        # Report the provider that was actually used
+        return ocr_result, ocr_result.get('provider_used', 'multi')
+    return ocr_result, provider_name
+
+def previous_extraction(
+    db: Session, file_path: str, sha256: str, provider_name: str
+) -> Optional[CachedExtraction]:
+    """
+    Look up an earlier form made from the same file. The new upload is hard-linked
+    to the stored copy, and that form's OCR result is returned when it came from
+    the requested provider.
+    """
+    previous = db.query(
+        AdmissionForm.file_path,
+        AdmissionForm.ocr_provider,
+        AdmissionForm.status,
+        AdmissionForm.extracted_data,
+    ).filter(AdmissionForm.file_sha256 == sha256).order_by(AdmissionForm.id.desc()).first()
+    if previous is None:
+        return None
+    
+    try:
+        link_duplicate_upload(resolve_upload_path(previous.file_path), file_path)
+    except ValueError:
+        pass
+    
+    # "best" records whichever provider won, so its results are only reused from the in-process cache
+    if (
+        previous.status in (FormStatus.EXTRACTED, FormStatus.VERIFIED)
+        and previous.ocr_provider == provider_name
+        and previous.extracted_data
+    ):
+        return previous.extracted_data, previous.ocr_provider
+    return None
+
+def save_form(db: Session, form: AdmissionForm) -> FormResponse:
+    """Insert a processed upload with a single commit and serialise it without a reload."""
+    db.add(form)
+    db.flush()
+    response = FormResponse.model_validate(form)
+    db.commit()
+    return response
+
+def ocr_error_message(error: Exception) -> str:
+    error_msg = str(error)
+    # Provide more helpful error messages
+    if "tesseract" in error_msg.lower() and "not found" in error_msg.lower():
+        error_msg = "Tesseract OCR is not installed or not found. Please install Tesseract OCR and ensure it's in your PATH or set TESSERACT_CMD environment variable."
+    elif "broken data stream" in error_msg.lower() or ("invalid" in error_msg.lower() and "image" in error_msg.lower()):
+        error_msg = f"Image file is corrupted or invalid: {error_msg}"
+    return error_msg
+
+async def extract_form_data(
+    form: AdmissionForm,
+    file_path: str,
+    sha256: str,
+    original_filename: Optional[str],
+    provider_name: str,
+    previous: Optional[CachedExtraction],
+) -> None:
+    """OCR an uploaded file and fill in the form's extraction result and SRCC fields."""
+    # Check if it's a PDF - process all pages
+    is_pdf = get_file_extension(file_path) == 'pdf'
+    
+    # Re-uploads of the same scan reuse the earlier OCR result
+    cached = get_cached_ocr_result(sha256, provider_name) or previous
+    if cached is None:
+        ocr_result, form.ocr_provider = await extract_upload(
+            file_path, is_pdf, provider_name, form.total_pages
+        )
+        cache_ocr_result(sha256, provider_name, ocr_result, form.ocr_provider)
+    else:
+        ocr_result, form.ocr_provider = cached
+    
+    # Parse structured data from OCR text for SRCC forms
+    if ocr_result.get('raw_text'):
+        # Check if this is an SRCC form based on filename pattern
+        is_srcc_form = is_srcc_filename(original_filename)
+        if is_srcc_form:
+            structured_data = parse_form_text(ocr_result['raw_text'], form_type='srcc')
+            ocr_result['structured_data'] = structured_data
+            # Auto-fill all form fields if available
+            for field, value in autofill_values(structured_data).items():
+                setattr(form, field, value)
+    
+    # Update form with extracted data
+    form.extracted_data = ocr_result
+    form.status = FormStatus.EXTRACTED
+
+async def run_upload_extraction(
+    form_id: int,
+    file_path: str,
+    sha256: str,
+    original_filename: Optional[str],
+    provider_name: str,
+    previous: Optional[CachedExtraction],
+) -> None:
+    """Background half of an upload: OCR the saved file and store the result on its form."""
+    db = SessionLocal()
+    try:
+        form = db.get(AdmissionForm, form_id, options=[raiseload('*')])
+        if form is None:
+            # Deleted before extraction started
+            return
+        try:
+            await extract_form_data(form, file_path, sha256, original_filename, provider_name, previous)
+        except Exception:
+            db.rollback()
+            form.status = FormStatus.ERROR
+            logger.exception("OCR extraction failed for form %s with provider %s", form_id, provider_name)
+        db.commit()
+    finally:
+        db.close()
+
+def fail_stale_extractions() -> int:
+    """
+    Mark background extractions that can no longer finish as failed. Tasks die with
+    the worker process that ran them, so called at startup; forms still extracting
+    after OCR_STALE_EXTRACTION_MINUTES are treated as lost.
+    """
+    cutoff = datetime.utcnow() - timedelta(minutes=settings.OCR_STALE_EXTRACTION_MINUTES)
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            update(AdmissionForm)
+            .where(
+                AdmissionForm.status == FormStatus.EXTRACTING,
+                func.coalesce(AdmissionForm.updated_at, AdmissionForm.upload_date) < cutoff,
+            )
+            .values(status=FormStatus.ERROR)
+        )
+        db.commit()
+    finally:
+        db.close()
+    if result.rowcount:
+        logger.warning("Marked %s interrupted extractions as failed", result.rowcount)
+    return result.rowcount
+
+@router.post(
+    "/upload",
+    response_model=FormResponse,
+    status_code=201,
+    responses={202: {"model": FormResponse, "description": "Form accepted, OCR still running (?async=true)"}},
+)
 async def upload_form(
+    background_tasks: BackgroundTasks,
+    response: Response,
     file: UploadFile = File(...),
     ocr_provider: str = None,
+    run_async: bool = Query(False, alias="async"),
     db: Session = Depends(get_db)
 ):
     """
-    Upload a scanned admission form and automatically extract text using OCR
+    Upload a scanned admission form and automatically extract text using OCR.
+    
+    Returns the extracted form (201). With ?async=true the form is returned straight
+    away (202) with status "extracting" and OCR runs in the background; poll
+    GET /api/forms/{id} until the status changes.
     """
     try:
         # Save uploaded file
-        file_path, filename = await save_uploaded_file(file)
+        file_path, filename, sha256 = await save_uploaded_file(file)
         
         # Determine OCR provider
         provider_name = (ocr_provider or settings.OCR_PROVIDER).lower()
         
         # Create form record - store relative path for file serving
-        # Convert absolute path to relative path from uploads directory
-        import os
-        from pathlib import Path
-        upload_dir = Path(settings.UPLOAD_DIR).resolve()
-        file_path_obj = Path(file_path).resolve()
-        
-        # Store relative path for serving files
-        relative_path = os.path.relpath(file_path_obj, upload_dir)
-        
+        # (the saved name is already relative to the uploads directory)
         form = AdmissionForm(
             filename=file.filename or filename,
-            file_path=relative_path,  # Store relative path
+            file_path=filename,  # Store relative path
             ocr_provider=provider_name if provider_name != "best" else "multi",  # Store actual provider used
-            status=FormStatus.EXTRACTING
+            total_pages=await asyncio.to_thread(get_page_count, file_path),
+            file_sha256=sha256,
         )
-        db.add(form)
-        db.commit()
-        db.refresh(form)
+        # Looked up before this form is inserted, so it can never match itself
+        previous = previous_extraction(db, file_path, sha256, provider_name)
+        
+        if run_async:
+            form.status = FormStatus.EXTRACTING
+            saved = save_form(db, form)
+            background_tasks.add_task(
+                run_upload_extraction, saved.id, file_path, sha256, file.filename, provider_name, previous
+            )
+            response.status_code = 202
+            return saved
         
-        # Perform OCR extraction
+        # Perform OCR extraction; the form is written once, when it has finished
         try:
-            # Check if it's a PDF - process all pages
-            file_ext = file.filename.split('.')[-1].lower() if file.filename else ""
-            is_pdf = file_ext == 'pdf'
-            
-            if is_pdf:
-                # Load all pages from PDF
-                from backend.utils.file_handler import load_all_pdf_pages
-                pages = load_all_pdf_pages(file_path)
-                
-                # Process each page with OCR and combine results
-                all_raw_text = []
-                all_confidences = []
-                page_results = []
-                
-                provider = get_ocr_provider(provider_name) if provider_name != "best" else None
-                
-                for page_num, page_image in enumerate(pages):
-                    try:
-                        # Handle multi-provider "best" mode
-                        if provider_name == "best":
-                            from backend.ocr.multi_provider import MultiProviderOCR
-                            multi_ocr = MultiProviderOCR()
-                            page_result = await multi_ocr.extract_with_best_provider(page_image)
-                            if page_num == 0:
-                                form.ocr_provider = page_result.get('provider_used', 'multi')
-                        else:
-                            # Use enhanced OCR extraction with preprocessing
-                            if provider_name == "tesseract":
-                                page_result = await provider.extract_text(page_image, preprocess=True)
-                            else:
-                                page_result = await provider.extract_text(page_image)
-                        
-                        # Collect text and confidence from each page
-                        if page_result.get('raw_text'):
-                            all_raw_text.append(f"\n--- Page {page_num + 1} ---\n{page_result['raw_text']}")
-                            if page_result.get('confidence'):
-                                all_confidences.append(page_result['confidence'])
-                        
-                        page_results.append({
-                            'page': page_num + 1,
-                            'raw_text': page_result.get('raw_text', ''),
-                            'confidence': page_result.get('confidence', 0.0)
-                        })
-                        
-                    except Exception as page_error:
-                        # Continue with other pages if one fails
-                        print(f"Error processing page {page_num + 1}: {str(page_error)}")
-                        continue
-                
-                # Combine all pages' text
-                combined_text = "\n".join(all_raw_text)
-                avg_confidence = sum(all_confidences) / len(all_confidences) if all_confidences else 0.0
-                
-                ocr_result = {
-                    "raw_text": combined_text,
-                    "confidence": round(avg_confidence, 2),
-                    "structured_data": None,
-                    "provider": form.ocr_provider,
-                    "pages_processed": len(pages),
-                    "page_results": page_results
-                }
-            else:
-                # Single image file - process normally
-                image = load_image(file_path)
-                
-                # Handle multi-provider "best" mode
-                if provider_name == "best":
-                    from backend.ocr.multi_provider import MultiProviderOCR
-                    multi_ocr = MultiProviderOCR()
-                    ocr_result = await multi_ocr.extract_with_best_provider(image)
-                    # Update provider name to the one that was actually used
-                    form.ocr_provider = ocr_result.get('provider_used', 'multi')
-                else:
-                    provider = get_ocr_provider(provider_name)
-                    # Use enhanced OCR extraction with preprocessing
-                    # For Tesseract, pass preprocess=True for better results
-                    if provider_name == "tesseract":
-                        ocr_result = await provider.extract_text(image, preprocess=True)
-                    else:
-                        ocr_result = await provider.extract_text(image)
-            
-            # Parse structured data from OCR text for SRCC forms
-            if ocr_result.get('raw_text'):
-                from backend.utils.form_parser import parse_form_text
-                # Check if this is an SRCC form based on filename pattern
-                is_srcc_form = 'srcc' in (file.filename or '').lower() or 'data form' in (file.filename or '').lower()
-                if is_srcc_form:
-                    structured_data = parse_form_text(ocr_result['raw_text'], form_type='srcc')
-                    ocr_result['structured_data'] = structured_data
-                    # Auto-fill all form fields if available
-                    # Basic Details
-                    for field in ['student_name', 'date_of_birth', 'gender', 'category', 'nationality', 
-                                 'religion', 'aadhar_number', 'blood_group']:
-                        if structured_data.get(field):
-                            setattr(form, field, structured_data[field])
-                    
-                    # Address Details
-                    for field in ['permanent_address', 'correspondence_address', 'pincode', 'city', 'state']:
-                        if structured_data.get(field):
-                            setattr(form, field, structured_data[field])
-                    
-                    # Contact Details
-                    for field in ['phone_number', 'alternate_phone', 'email', 'emergency_contact_name', 
-                                 'emergency_contact_phone']:
-                        if structured_data.get(field):
-                            setattr(form, field, structured_data[field])
-                    
-                    # Guardian/Parent Details
-                    for field in ['father_name', 'father_occupation', 'father_phone', 'mother_name', 
-                                 'mother_occupation', 'mother_phone', 'guardian_name', 'guardian_relation', 
-                                 'guardian_phone', 'annual_income']:
-                        if structured_data.get(field):
-                            setattr(form, field, structured_data[field])
-                    
-                    # Educational Qualifications
-                    for field in ['tenth_board', 'tenth_year', 'tenth_percentage', 'tenth_school',
-                                 'twelfth_board', 'twelfth_year', 'twelfth_percentage', 'twelfth_school',
-                                 'previous_qualification', 'graduation_details']:
-                        if structured_data.get(field):
-                            setattr(form, field, structured_data[field])
-                    
-                    # Course Application Details
-                    for field in ['course_applied', 'application_number', 'admission_date']:
-                        if structured_data.get(field):
-                            setattr(form, field, structured_data[field])
-            
-            # Update form with extracted data
-            form.extracted_data = ocr_result
-            form.status = FormStatus.EXTRACTED
-            db.commit()
-            
+            await extract_form_data(form, file_path, sha256, file.filename, provider_name, previous)
         except Exception as e:
             form.status = FormStatus.ERROR
+            db.add(form)
             db.commit()
-            error_msg = str(e)
-            # Provide more helpful error messages
-            if "tesseract" in error_msg.lower() and "not found" in error_msg.lower():
-                error_msg = "Tesseract OCR is not installed or not found. Please install Tesseract OCR and ensure it's in your PATH or set TESSERACT_CMD environment variable."
-            elif "broken data stream" in error_msg.lower() or ("invalid" in error_msg.lower() and "image" in error_msg.lower()):
-                error_msg = f"Image file is corrupted or invalid: {error_msg}"
-            raise HTTPException(status_code=500, detail=f"OCR extraction failed: {error_msg}")
+            raise HTTPException(status_code=500, detail=f"OCR extraction failed: {ocr_error_message(e)}")
         
-        return FormResponse.model_validate(form)
+        return save_form(db, form)
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -211,141 +335,70 @@ async def upload_form_pages(
         raise HTTPException(status_code=400, detail="At least one file is required")
     
     try:
-        from backend.utils.file_handler import save_uploaded_file, load_image, get_file_extension
-        from pathlib import Path
-        import os
-        
         # Determine OCR provider
         provider_name = (ocr_provider or settings.OCR_PROVIDER).lower()
         
-        # Save all files and collect paths
-        saved_files = []
-        pages = []
-        
-        for file in files:
-            # Save uploaded file
-            file_path, filename = await save_uploaded_file(file)
-            
-            # Load image
-            file_ext = get_file_extension(file_path)
-            if file_ext == 'pdf':
-                from backend.utils.file_handler import load_all_pdf_pages
-                pdf_pages = load_all_pdf_pages(file_path)
-                pages.extend(pdf_pages)
-            else:
-                image = load_image(file_path)
-                pages.append(image)
-            
-            saved_files.append((file_path, filename))
+        # Save all files concurrently
+        saved_files = await asyncio.gather(*(save_uploaded_file(file) for file in files))
         
         # Use first file's name for the form record
-        first_file_path, first_filename = saved_files[0]
-        upload_dir = Path(settings.UPLOAD_DIR).resolve()
-        file_path_obj = Path(first_file_path).resolve()
-        relative_path = os.path.relpath(file_path_obj, upload_dir)
+        first_file_path, first_filename, first_sha256 = saved_files[0]
+        # A single file identifies the whole form, so it can be matched against earlier uploads
+        single_file = len(saved_files) == 1
         
         # Create form record
         form = AdmissionForm(
             filename=files[0].filename or first_filename,
-            file_path=relative_path,
+            file_path=first_filename,
             ocr_provider=provider_name if provider_name != "best" else "multi",
-            status=FormStatus.EXTRACTING
+            total_pages=await asyncio.to_thread(get_page_count, first_file_path),
+            file_sha256=first_sha256 if single_file else None,
         )
-        db.add(form)
-        db.commit()
-        db.refresh(form)
         
-        # Perform OCR extraction on all pages
+        # Re-uploads of the same set of scans reuse the earlier OCR result; the
+        # key is kept apart from single-file uploads, whose results are shaped differently
+        digest = "pages:" + hashlib.sha256(
+            "".join(sha256 for _, _, sha256 in saved_files).encode()
+        ).hexdigest()
+        cached = get_cached_ocr_result(digest, provider_name)
+        if single_file:
+            previous = previous_extraction(db, first_file_path, first_sha256, provider_name)
+            cached = cached or previous
+        if cached is None:
+            # Pages are only rendered/decoded when there is no earlier result to reuse
+            pages = await load_upload_pages([file_path for file_path, _, _ in saved_files])
+        
+        # Perform OCR extraction on all pages; the form is written once, when it has finished
         try:
-            all_raw_text = []
-            all_confidences = []
-            page_results = []
-            
-            provider = get_ocr_provider(provider_name) if provider_name != "best" else None
-            
-            for page_num, page_image in enumerate(pages):
-                try:
-                    # Handle multi-provider "best" mode
-                    if provider_name == "best":
-                        from backend.ocr.multi_provider import MultiProviderOCR
-                        multi_ocr = MultiProviderOCR()
-                        page_result = await multi_ocr.extract_with_best_provider(page_image)
-                        if page_num == 0:
-                            form.ocr_provider = page_result.get('provider_used', 'multi')
-                    else:
-                        # Use enhanced OCR extraction with preprocessing
-                        if provider_name == "tesseract":
-                            page_result = await provider.extract_text(page_image, preprocess=True)
-                        else:
-                            page_result = await provider.extract_text(page_image)
-                    
-                    # Collect text and confidence from each page
-                    if page_result.get('raw_text'):
-                        all_raw_text.append(f"\n--- Page {page_num + 1} ---\n{page_result['raw_text']}")
-                        if page_result.get('confidence'):
-                            all_confidences.append(page_result['confidence'])
-                    
-                    page_results.append({
-                        'page': page_num + 1,
-                        'raw_text': page_result.get('raw_text', ''),
-                        'confidence': page_result.get('confidence', 0.0)
-                    })
-                    
-                except Exception as page_error:
-                    print(f"Error processing page {page_num + 1}: {str(page_error)}")
-                    continue
-            
-            # Combine all pages' text
-            combined_text = "\n".join(all_raw_text)
-            avg_confidence = sum(all_confidences) / len(all_confidences) if all_confidences else 0.0
-            
-            ocr_result = {
-                "raw_text": combined_text,
-                "confidence": round(avg_confidence, 2),
-                "structured_data": None,
-                "provider": form.ocr_provider,
-                "pages_processed": len(pages),
-                "page_results": page_results
-            }
+            if cached is None:
+                # OCR all pages concurrently and combine results
+                ocr_result = await ocr_page_images(pages, provider_name)
+                form.ocr_provider = ocr_result["provider"]
+                cache_ocr_result(digest, provider_name, ocr_result, form.ocr_provider)
+            else:
+                ocr_result, form.ocr_provider = cached
             
             # Parse structured data from OCR text for SRCC forms
             if ocr_result.get('raw_text'):
-                from backend.utils.form_parser import parse_form_text
-                is_srcc_form = 'srcc' in (files[0].filename or '').lower() or 'data form' in (files[0].filename or '').lower()
+                is_srcc_form = is_srcc_filename(files[0].filename)
                 if is_srcc_form:
                     structured_data = parse_form_text(ocr_result['raw_text'], form_type='srcc')
                     ocr_result['structured_data'] = structured_data
                     # Auto-fill all form fields if available
-                    for field in ['student_name', 'date_of_birth', 'gender', 'category', 'nationality', 
-                                 'religion', 'aadhar_number', 'blood_group', 'permanent_address', 
-                                 'correspondence_address', 'pincode', 'city', 'state', 'phone_number', 
-                                 'alternate_phone', 'email', 'emergency_contact_name', 'emergency_contact_phone',
-                                 'father_name', 'father_occupation', 'father_phone', 'mother_name', 
-                                 'mother_occupation', 'mother_phone', 'guardian_name', 'guardian_relation', 
-                                 'guardian_phone', 'annual_income', 'tenth_board', 'tenth_year', 
-                                 'tenth_percentage', 'tenth_school', 'twelfth_board', 'twelfth_year', 
-                                 'twelfth_percentage', 'twelfth_school', 'previous_qualification', 
-                                 'graduation_details', 'course_applied', 'application_number', 'admission_date']:
-                        if structured_data.get(field):
-                            setattr(form, field, structured_data[field])
+                    for field, value in autofill_values(structured_data).items():
+                        setattr(form, field, value)
             
             # Update form with extracted data
             form.extracted_data = ocr_result
             form.status = FormStatus.EXTRACTED
-            db.commit()
             
         except Exception as e:
             form.status = FormStatus.ERROR
+            db.add(form)
             db.commit()
-            error_msg = str(e)
-            # Provide more helpful error messages
-            if "tesseract" in error_msg.lower() and "not found" in error_msg.lower():
-                error_msg = "Tesseract OCR is not installed or not found. Please install Tesseract OCR and ensure it's in your PATH or set TESSERACT_CMD environment variable."
-            elif "broken data stream" in error_msg.lower() or ("invalid" in error_msg.lower() and "image" in error_msg.lower()):
-                error_msg = f"Image file is corrupted or invalid: {error_msg}"
-            raise HTTPException(status_code=500, detail=f"OCR extraction failed: {error_msg}")
+            raise HTTPException(status_code=500, detail=f"OCR extraction failed: {ocr_error_message(e)}")
         
-        return FormResponse.model_validate(form)
+        return save_form(db, form)
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -360,7 +413,6 @@ async def list_ocr_providers():
     For Azure Form Recognizer, includes information about custom models.
     See: https://learn.microsoft.com/en-us/azure/ai-services/document-intelligence/train/custom-model
     """
-    from backend.ocr.ocr_factory import OCRFactory, get_ocr_provider
     available = OCRFactory.get_available_providers()
     # Add "best" option if multiple providers are available
     if len(available) > 1:
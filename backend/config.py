@@ -1,11 +1,21 @@
-from pydantic import Field, model_validator
+from pydantic import Field, PrivateAttr, model_validator
 from pydantic_settings import BaseSettings
 from typing import List
 
 class Settings(BaseSettings):
     # Database
     # Default to SQLite for easy setup, can be overridden with PostgreSQL
+    # (SQLite is opened in WAL mode; use PostgreSQL for production and concurrent uploads)
     DATABASE_URL: str = "sqlite:///./admission_forms.db"
+    # Connection pool for server databases (PostgreSQL); ignored for SQLite
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection before failing
+    DB_POOL_RECYCLE: int = 3600  # Reopen connections older than this (seconds; -1 never)
+    DB_ECHO_POOL: bool = False  # Log pool checkouts/checkins
+    # Create missing tables/indexes when the app starts; turn off where the schema is
+    # set up at deploy time so workers don't each repeat the DDL checks on boot
+    AUTO_CREATE_SCHEMA: bool = True
     
     # OCR Provider (tesseract, google, azure, abbyy)
     OCR_PROVIDER: str = "tesseract"
@@ -20,6 +30,13 @@ class Settings(BaseSettings):
         default_factory=list,
         description="Optional list of providers to benchmark; defaults to enabled providers."
     )
+    OCR_CONCURRENCY: int = Field(
+        4, description="Maximum pages OCR'd at once per request (capped at the CPU count)."
+    )
+    OCR_STALE_EXTRACTION_MINUTES: int = Field(
+        30,
+        description="At startup, background extractions started longer ago than this are marked as failed.",
+    )
 
     # OCR Preprocessing
     OCR_PREPROCESSING_ENABLED: bool = Field(
@@ -50,6 +67,13 @@ class Settings(BaseSettings):
         2400,
         description="Maximum long-edge dimension after scaling. Set to 0 to disable the cap.",
     )
+    OCR_RENDER_DPI: int = Field(
+        216,
+        description=(
+            "Resolution PDF pages are rasterized at. Pages whose long edge would exceed "
+            "OCR_PREPROCESSING_MAX_DIMENSION are rendered at that size instead."
+        ),
+    )
     OCR_PREPROCESSING_BINARIZE: bool = Field(
         True, description="Convert grayscale image to black/white after adjustments."
     )
@@ -94,9 +118,16 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS: List[str] = ["jpg", "jpeg", "png", "pdf", "tiff", "bmp"]
     
+    # Rendered preview cache (JPEGs keyed by form, page and file mtime)
+    PREVIEW_CACHE_DIR: str = "preview_cache"
+    PREVIEW_CACHE_MAX_FILES: int = 500
+    
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:5173"]
     
+    # Provider names the flags above enable, derived once during validation
+    _enabled_providers: frozenset[str] = PrivateAttr(frozenset())
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -145,7 +176,13 @@ class Settings(BaseSettings):
                     f"Enabled providers: {readable}"
                 )
 
+        values._enabled_providers = frozenset(enabled_map)
         return values
 
+    @property
+    def enabled_providers(self) -> frozenset[str]:
+        """Provider names enabled in configuration, including "multi"/"best" when two or more are."""
+        return self._enabled_providers
+
 settings = Settings()
 
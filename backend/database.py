@@ -1,19 +1,62 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Enum as SQLEnum, JSON, ForeignKey, BigInteger, Index
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Enum as SQLEnum, JSON, ForeignKey, BigInteger, Index, DDL, event, func, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
 import enum
+import orjson
 from backend.config import settings
 
-# Support SQLite with check_same_thread=False
-connect_args = {}
-if settings.DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
+# Readers don't block the writer in WAL mode, and commits skip the per-transaction fsync
+# (a crash can lose the last commits but never corrupts the database)
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+def _json_serializer(value) -> str:
+    # OCR payloads (extracted_data) run to hundreds of KB; orjson encodes them far faster than json
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+JSON_ENGINE_OPTIONS = {"json_serializer": _json_serializer, "json_deserializer": orjson.loads}
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+if settings.DATABASE_URL.startswith("sqlite"):
+    # Support SQLite with check_same_thread=False
+    engine = create_engine(
+        settings.DATABASE_URL, connect_args={"check_same_thread": False}, **JSON_ENGINE_OPTIONS
+    )
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+else:
+    engine = create_engine(
+        settings.DATABASE_URL,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        # Recycle before server/proxy idle timeouts close connections underneath the pool
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        # Drop connections the server closed while idle instead of failing the request
+        pool_pre_ping=True,
+        echo_pool=settings.DB_ECHO_POOL,
+        **JSON_ENGINE_OPTIONS,
+    )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Trigram indexes (gin_trgm_ops) need the pg_trgm extension on PostgreSQL
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
 class FormStatus(str, enum.Enum):
     UPLOADED = "uploaded"
     EXTRACTING = "extracting"
@@ -40,11 +83,20 @@ class StudentProfile(Base):
     updated_date = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    forms = relationship("AdmissionForm", back_populates="student_profile")
-    documents = relationship("StudentDocument", back_populates="student_profile")
+    # Profiles are always read with counts or explicit loader options; an implicit
+    # lazy load here would be an N+1, so it raises instead
+    forms = relationship("AdmissionForm", back_populates="student_profile", lazy="raise")
+    documents = relationship("StudentDocument", back_populates="student_profile", lazy="raise")
     
     __table_args__ = (
         Index('idx_student_name_aadhar', 'student_name', 'aadhar_number'),
+        # Backs substring name search (LIKE '%x%' on lower(student_name))
+        Index(
+            'idx_student_name_trgm',
+            func.lower(student_name).label('student_name_lower'),
+            postgresql_using='gin',
+            postgresql_ops={'student_name_lower': 'gin_trgm_ops'},
+        ),
     )
 
 class AdmissionForm(Base):
@@ -53,19 +105,33 @@ class AdmissionForm(Base):
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
-    upload_date = Column(DateTime, default=datetime.utcnow)
+    upload_date = Column(DateTime, nullable=False, default=datetime.utcnow)
     ocr_provider = Column(String, nullable=False)
     status = Column(SQLEnum(FormStatus), default=FormStatus.UPLOADED)
     
     # Link to student profile
     student_profile_id = Column(Integer, ForeignKey("student_profiles.id"), nullable=True, index=True)
     
-    # OCR extracted data (raw JSON)
-    extracted_data = Column(JSON, nullable=True)
+    # OCR extracted data (raw JSON); binary JSONB on PostgreSQL
+    extracted_data = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+    
+    # Page count of the stored file, recorded at upload (NULL on older rows)
+    total_pages = Column(Integer, nullable=True)
+    
+    # SHA-256 of the stored file when the form was made from a single upload; later
+    # uploads of the same file reuse its OCR result and share it on disk
+    file_sha256 = Column(String(64), nullable=True, index=True)
     
     # Relationships
-    student_profile = relationship("StudentProfile", back_populates="forms")
-    documents = relationship("StudentDocument", back_populates="form")
+    student_profile = relationship("StudentProfile", back_populates="forms", lazy="raise")
+    # Every form detail response includes its documents; loading them in one batched
+    # IN query also covers forms returned by UPDATE ... RETURNING
+    documents = relationship(
+        "StudentDocument",
+        back_populates="form",
+        order_by="StudentDocument.upload_date.desc()",
+        lazy="selectin",
+    )
     
     # Verified student information - Basic Details
     student_name = Column(String, nullable=True)
@@ -126,6 +192,37 @@ class AdmissionForm(Base):
     
     verified_date = Column(DateTime, nullable=True)
     verified_by = Column(String, nullable=True)
+    # Bumped by every UPDATE (ORM or Core); NULL on rows not updated since it was added
+    updated_at = Column(DateTime, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        # Status-filtered search pages are ordered by upload_date DESC, id DESC (and keyset
+        # cursors seek on both), so the index carries the id tie-breaker too
+        Index('idx_form_status_upload_id', status, upload_date.desc(), id.desc()),
+        # Matches search/export ORDER BY upload_date DESC, id DESC when no status is given
+        Index('idx_form_upload_id', upload_date.desc(), id.desc()),
+        # Work queue (anything not yet verified) on PostgreSQL: a partial index that leaves
+        # out the verified bulk of the table. Enum columns store member names, hence 'VERIFIED'
+        Index(
+            'idx_form_pending_upload_id',
+            upload_date.desc(),
+            id.desc(),
+            postgresql_where=text("status != 'VERIFIED'"),
+        ).ddl_if(dialect='postgresql'),
+        # Back the ILIKE '%x%' search filters on PostgreSQL
+        *(
+            Index(
+                f'idx_form_{name}_trgm',
+                name,
+                postgresql_using='gin',
+                postgresql_ops={name: 'gin_trgm_ops'},
+            ).ddl_if(dialect='postgresql')
+            for name in (
+                'student_name', 'phone_number', 'email', 'course_applied',
+                'enrollment_number', 'application_number',
+            )
+        ),
+    )
 
 class StudentDocument(Base):
     __tablename__ = "student_documents"
@@ -133,7 +230,9 @@ class StudentDocument(Base):
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
-    upload_date = Column(DateTime, default=datetime.utcnow)
+    upload_date = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Native ENUM on PostgreSQL: stored as a 4-byte OID, so index keys are already
+    # fixed-width and compared as integers (no VARCHAR comparison involved)
     document_category = Column(SQLEnum(DocumentCategory), nullable=False, index=True)
     description = Column(Text, nullable=True)
     file_size = Column(BigInteger, nullable=False)  # Size in bytes
@@ -143,14 +242,90 @@ class StudentDocument(Base):
     student_profile_id = Column(Integer, ForeignKey("student_profiles.id"), nullable=True, index=True)
     
     # Relationships
-    form = relationship("AdmissionForm", back_populates="documents")
-    student_profile = relationship("StudentProfile", back_populates="documents")
+    # Documents are served on their own; their parents are never navigated to
+    form = relationship("AdmissionForm", back_populates="documents", lazy="raise")
+    student_profile = relationship("StudentProfile", back_populates="documents", lazy="raise")
     
     __table_args__ = (
         Index('idx_form_category', 'form_id', 'document_category'),
         Index('idx_profile_category', 'student_profile_id', 'document_category'),
+        # Document search filters on one of these and always sorts newest first
+        Index('idx_doc_form_upload', form_id, upload_date.desc()),
+        Index('idx_doc_profile_upload', student_profile_id, upload_date.desc()),
+        Index('idx_doc_category_upload', document_category, upload_date.desc()),
     )
 
+# Indexes an earlier release created that a model index now replaces
+SUPERSEDED_INDEXES = (
+    "idx_form_status_upload",  # replaced by idx_form_status_upload_id
+)
+
+# Columns made NOT NULL after release; rows still holding NULL get the upgrade time
+NOT_NULL_BACKFILLS = (
+    ("admission_forms", "upload_date"),  # keyset cursors page on it
+    ("student_documents", "upload_date"),
+)
+
+def _backfill_not_null(connection) -> None:
+    """Fill NULLs left in columns that are now NOT NULL, and enforce it where possible."""
+    preparer = connection.dialect.identifier_preparer
+    for table_name, column_name in NOT_NULL_BACKFILLS:
+        table = Base.metadata.tables[table_name]
+        column = table.c[column_name]
+        connection.execute(table.update().where(column.is_(None)).values({column: datetime.utcnow()}))
+        # SQLite cannot change a column's nullability in place; the ORM default fills it there
+        if connection.dialect.name == "postgresql":
+            connection.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ALTER COLUMN {preparer.format_column(column)} SET NOT NULL"
+            ))
+
+def _add_missing_columns(connection) -> None:
+    """Add columns introduced after a table was created."""
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        added = [column for column in table.columns if column.name not in existing]
+        for column in added:
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+            ))
+
+def _index_names(connection) -> set[str]:
+    """Names of the indexes already in the database."""
+    if connection.dialect.name == "sqlite":
+        # SQLite reflection skips expression indexes such as lower(student_name)
+        rows = connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))
+        return set(rows.scalars())
+    inspector = inspect(connection)
+    return {
+        index["name"]
+        for table in Base.metadata.sorted_tables
+        for index in inspector.get_indexes(table.name)
+    }
+
+def create_schema(bind=engine) -> None:
+    """
+    Create missing tables and indexes, then bring existing tables up to date.
+    create_all never alters a table that already exists, so columns and indexes
+    added to the models later are created here, replaced indexes dropped, and
+    columns that became NOT NULL backfilled.
+    """
+    with bind.begin() as connection:
+        Base.metadata.create_all(bind=connection)
+        _add_missing_columns(connection)
+        _backfill_not_null(connection)
+        existing = _index_names(connection)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(connection)
+        for name in SUPERSEDED_INDEXES:
+            connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
@@ -2,24 +2,39 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from backend.config import settings
-from backend.database import engine, Base
+from backend.database import create_schema
 from backend.api.routes import upload, forms, export, files, documents, students
+from backend.ocr.page_runner import shutdown_ocr_pool
+from contextlib import asynccontextmanager
 import os
 
 # Create database tables (optional - will fail if DB not available)
-try:
-    Base.metadata.create_all(bind=engine)
-except Exception as e:
-    print(f"Warning: Could not connect to database: {e}")
-    print("The server will start, but database operations may fail.")
+if settings.AUTO_CREATE_SCHEMA:
+    try:
+        create_schema()
+    except Exception as e:
+        print(f"Warning: Could not connect to database: {e}")
+        print("The server will start, but database operations may fail.")
 
 # Ensure upload directory exists
 os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background extractions of a previous run died with its process
+    try:
+        upload.fail_stale_extractions()
+    except Exception as e:
+        print(f"Warning: Could not check for interrupted extractions: {e}")
+    yield
+    # OCR and preview rendering share one process pool; stop its workers with the app
+    shutdown_ocr_pool()
+
 app = FastAPI(
     title="Student Admission Form Digitization System",
     description="OCR-based system for digitizing handwritten admission forms",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware for frontend
@@ -29,6 +44,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 # Include routers
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from backend.database import DocumentCategory
 
 class DocumentCreate(BaseModel):
@@ -27,3 +27,5 @@ class DocumentDetailResponse(DocumentResponse):
     """Extended response with full details"""
     pass
 
+# Validates a whole list of ORM rows in one call instead of one model_validate per row
+DOCUMENT_LIST_ADAPTER = TypeAdapter(List[DocumentResponse])
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from backend.database import FormStatus
@@ -38,7 +38,8 @@ class ExtractedData(BaseModel):
     pages_processed: Optional[int] = None
     page_results: Optional[List[PageExtraction]] = None
 
-class StudentInfo(BaseModel):
+class StudentFields(BaseModel):
+    """Student details shared by extraction, verification and form detail models."""
     # Basic Details
     student_name: Optional[str] = None
     date_of_birth: Optional[str] = None
@@ -95,123 +96,30 @@ class StudentInfo(BaseModel):
     
     additional_info: Optional[Dict[str, Any]] = None
 
-class FormVerification(BaseModel):
-    # Basic Details
-    student_name: Optional[str] = None
-    date_of_birth: Optional[str] = None
-    gender: Optional[str] = None
-    category: Optional[str] = None
-    nationality: Optional[str] = None
-    religion: Optional[str] = None
-    aadhar_number: Optional[str] = None
-    blood_group: Optional[str] = None
-    
-    # Address Details
-    permanent_address: Optional[str] = None
-    correspondence_address: Optional[str] = None
-    pincode: Optional[str] = None
-    city: Optional[str] = None
-    state: Optional[str] = None
-    
-    # Contact Details
-    phone_number: Optional[str] = None
-    alternate_phone: Optional[str] = None
-    email: Optional[str] = None
-    emergency_contact_name: Optional[str] = None
-    emergency_contact_phone: Optional[str] = None
-    
-    # Guardian/Parent Details
-    father_name: Optional[str] = None
-    father_occupation: Optional[str] = None
-    father_phone: Optional[str] = None
-    mother_name: Optional[str] = None
-    mother_occupation: Optional[str] = None
-    mother_phone: Optional[str] = None
-    guardian_name: Optional[str] = None
-    guardian_relation: Optional[str] = None
-    guardian_phone: Optional[str] = None
-    annual_income: Optional[str] = None
-    
-    # Educational Qualifications
-    tenth_board: Optional[str] = None
-    tenth_year: Optional[str] = None
-    tenth_percentage: Optional[str] = None
-    tenth_school: Optional[str] = None
-    twelfth_board: Optional[str] = None
-    twelfth_year: Optional[str] = None
-    twelfth_percentage: Optional[str] = None
-    twelfth_school: Optional[str] = None
-    previous_qualification: Optional[str] = None
-    graduation_details: Optional[str] = None
-    
-    # Course Application Details
-    course_applied: Optional[str] = None
-    application_number: Optional[str] = None
-    enrollment_number: Optional[str] = None
-    admission_date: Optional[str] = None
-    
-    additional_info: Optional[Dict[str, Any]] = None
+class StudentInfo(StudentFields):
+    pass
 
-class FormDetailResponse(FormResponse):
+class FormVerification(StudentFields):
+    pass
+
+class FormDetailResponse(StudentFields, FormResponse):
     extracted_data: Optional[ExtractedData] = None
     student_profile_id: Optional[int] = None
     documents: Optional[List["DocumentResponse"]] = None  # Populated at runtime
+    verified_date: Optional[datetime] = None
     
-    # Basic Details
+    class Config:
+        from_attributes = True
+
+class FormListItemResponse(FormResponse):
+    """Columns shown in form lists and search results (no OCR payload or documents)."""
+    student_profile_id: Optional[int] = None
     student_name: Optional[str] = None
-    date_of_birth: Optional[str] = None
-    gender: Optional[str] = None
-    category: Optional[str] = None
-    nationality: Optional[str] = None
-    religion: Optional[str] = None
-    aadhar_number: Optional[str] = None
-    blood_group: Optional[str] = None
-    
-    # Address Details
-    permanent_address: Optional[str] = None
-    correspondence_address: Optional[str] = None
-    pincode: Optional[str] = None
-    city: Optional[str] = None
-    state: Optional[str] = None
-    
-    # Contact Details
     phone_number: Optional[str] = None
-    alternate_phone: Optional[str] = None
     email: Optional[str] = None
-    emergency_contact_name: Optional[str] = None
-    emergency_contact_phone: Optional[str] = None
-    
-    # Guardian/Parent Details
-    father_name: Optional[str] = None
-    father_occupation: Optional[str] = None
-    father_phone: Optional[str] = None
-    mother_name: Optional[str] = None
-    mother_occupation: Optional[str] = None
-    mother_phone: Optional[str] = None
-    guardian_name: Optional[str] = None
-    guardian_relation: Optional[str] = None
-    guardian_phone: Optional[str] = None
-    annual_income: Optional[str] = None
-    
-    # Educational Qualifications
-    tenth_board: Optional[str] = None
-    tenth_year: Optional[str] = None
-    tenth_percentage: Optional[str] = None
-    tenth_school: Optional[str] = None
-    twelfth_board: Optional[str] = None
-    twelfth_year: Optional[str] = None
-    twelfth_percentage: Optional[str] = None
-    twelfth_school: Optional[str] = None
-    previous_qualification: Optional[str] = None
-    graduation_details: Optional[str] = None
-    
-    # Course Application Details
     course_applied: Optional[str] = None
     application_number: Optional[str] = None
     enrollment_number: Optional[str] = None
-    admission_date: Optional[str] = None
-    
-    additional_info: Optional[Dict[str, Any]] = None
     verified_date: Optional[datetime] = None
     
     class Config:
@@ -238,3 +146,4 @@ from backend.models.document import DocumentResponse  # noqa: E402
 
 FormDetailResponse.model_rebuild()
 
+FORM_DETAIL_LIST_ADAPTER = TypeAdapter(List[FormDetailResponse])
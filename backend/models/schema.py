@@ -5,6 +5,7 @@ from backend.models.form import (
     FormResponse,
     FormDetailResponse,
     ExtractedData,
+    StudentFields,
     StudentInfo,
     FormVerification,
     FormSearchParams
@@ -16,6 +17,7 @@ __all__ = [
     "FormResponse",
     "FormDetailResponse",
     "ExtractedData",
+    "StudentFields",
     "StudentInfo",
     "FormVerification",
     "FormSearchParams"
@@ -1,11 +1,34 @@
+import asyncio
 from typing import Dict, Any, Optional
 from PIL import Image
 import io
 import requests
 import base64
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from backend.ocr.base_provider import OCRProvider
 from backend.config import settings
 
+# Connections kept open per host, shared by all pages of all requests on this worker
+ABBYY_POOL_MAXSIZE = 16
+
+def _build_session() -> requests.Session:
+    """HTTP session that keeps connections alive and retries gateway errors."""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        # OCR submissions are safe to resend; urllib3 skips POST retries by default
+        allowed_methods=frozenset({"POST"}),
+        # Hand back the last response so raise_for_status reports it as before
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=ABBYY_POOL_MAXSIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 class ABBYYProvider(OCRProvider):
     """ABBYY FineReader provider - excellent handwriting recognition"""
     
@@ -14,28 +37,33 @@ class ABBYYProvider(OCRProvider):
         self._server_url = settings.ABBYY_SERVER_URL
         self._application_id = settings.ABBYY_APPLICATION_ID
         self._password = settings.ABBYY_PASSWORD
+        # Provider instances are cached, so one TLS handshake serves many pages
+        self._session = _build_session()
     
     async def extract_text(self, image: Image.Image, language: Optional[str] = None) -> Dict[str, Any]:
         """Extract text using ABBYY FineReader Server or Cloud OCR SDK"""
         try:
-            # Convert PIL Image to base64
+            # Convert PIL Image to PNG bytes; a light compression level is much faster to
+            # encode and the upload is still lossless
             img_byte_arr = io.BytesIO()
-            image.save(img_byte_arr, format='PNG')
-            img_byte_arr.seek(0)
-            image_base64 = base64.b64encode(img_byte_arr.getvalue()).decode('utf-8')
+            image.save(img_byte_arr, format='PNG', compress_level=1)
+            png_bytes = img_byte_arr.getvalue()
             
             # If server URL is configured, use FineReader Server API
             if self._server_url:
-                return await self._extract_via_server(image_base64, language)
+                return await self._extract_via_server(png_bytes, language)
             # Otherwise, try Cloud OCR SDK (REST API)
             else:
-                return await self._extract_via_cloud_sdk(image_base64, language)
+                return await self._extract_via_cloud_sdk(png_bytes, language)
                 
         except Exception as e:
             raise Exception(f"ABBYY FineReader error: {str(e)}")
     
-    async def _extract_via_server(self, image_base64: str, language: Optional[str]) -> Dict[str, Any]:
+    async def _extract_via_server(self, png_bytes: bytes, language: Optional[str]) -> Dict[str, Any]:
         """Extract text using ABBYY FineReader Server"""
+        # Only the server API takes the image inline, as a base64 data URL
+        image_base64 = base64.b64encode(png_bytes).decode('ascii')
+        
         # FineReader Server REST API endpoint
         url = f"{self._server_url}/documentprocessing/processDocument"
         
@@ -49,7 +77,10 @@ class ABBYYProvider(OCRProvider):
             "exportFormat": "txt"
         }
         
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
+        # The blocking HTTP call runs on a worker thread so the event loop keeps serving requests
+        response = await asyncio.to_thread(
+            self._session.post, url, json=payload, headers=headers, timeout=30
+        )
         response.raise_for_status()
         
         result = response.json()
@@ -63,7 +94,7 @@ class ABBYYProvider(OCRProvider):
             "provider": self.get_provider_name()
         }
     
-    async def _extract_via_cloud_sdk(self, image_base64: str, language: Optional[str]) -> Dict[str, Any]:
+    async def _extract_via_cloud_sdk(self, png_bytes: bytes, language: Optional[str]) -> Dict[str, Any]:
         """Extract text using ABBYY Cloud OCR SDK"""
         # ABBYY Cloud OCR SDK REST API
         url = "https://cloud-eu.ocrsdk.com/v2/processDocument"
@@ -72,7 +103,7 @@ class ABBYYProvider(OCRProvider):
         
         # Upload image
         files = {
-            "file": base64.b64decode(image_base64)
+            "file": png_bytes
         }
         
         params = {
@@ -80,7 +111,9 @@ class ABBYYProvider(OCRProvider):
             "exportFormat": "txt"
         }
         
-        response = requests.post(url, files=files, params=params, auth=auth, timeout=30)
+        response = await asyncio.to_thread(
+            self._session.post, url, files=files, params=params, auth=auth, timeout=30
+        )
         response.raise_for_status()
         
         result = response.json()
@@ -7,7 +7,7 @@ Supports:
 - Custom models: Template and Neural models trained via Document Intelligence Studio
   See: https://learn.microsoft.com/en-us/azure/ai-services/document-intelligence/train/custom-model
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from PIL import Image
 import io
 from backend.ocr.base_provider import OCRProvider
@@ -152,6 +152,44 @@ class AzureFormRecognizerProvider(OCRProvider):
         except Exception as e:
             raise Exception(f"Azure Form Recognizer error: {str(e)}")
     
+    # Pages the service analyzes in one request (S0 tier)
+    max_pdf_pages = 2000
+    
+    async def extract_pdf_pages(self, file_path: str) -> List[Dict[str, Any]]:
+        """
+        Extract text from every page of a PDF in a single analyze request
+        
+        Returns:
+            One result per page, in page order, shaped like extract_text's
+        """
+        try:
+            client = self._get_client()
+            
+            with open(file_path, "rb") as pdf_file:
+                poller = client.begin_analyze_document(
+                    model_id=self.model_id,
+                    document=pdf_file
+                )
+            result = poller.result()
+            
+            page_results = []
+            for page in result.pages or []:
+                page_text = "\n".join(line.content for line in page.lines or [])
+                word_confidences = [word.confidence * 100 for word in page.words or [] if word.confidence]
+                avg_confidence = (
+                    sum(word_confidences) / len(word_confidences) if word_confidences else 90.0
+                )
+                page_results.append({
+                    "raw_text": page_text.strip(),
+                    "confidence": round(avg_confidence, 2),
+                    "structured_data": None,
+                    "provider": self.get_provider_name()
+                })
+            return page_results
+            
+        except Exception as e:
+            raise Exception(f"Azure Form Recognizer error: {str(e)}")
+    
     def is_available(self) -> bool:
         """Check if Azure Form Recognizer is configured"""
         try:
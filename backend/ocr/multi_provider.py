@@ -1,10 +1,12 @@
 """
 Multi-provider OCR service that tries multiple providers and selects the best result
 """
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from PIL import Image
-from backend.ocr.ocr_factory import OCRFactory
+from backend.ocr.ocr_factory import OCRFactory, get_ocr_provider
 from backend.ocr.base_provider import OCRProvider
+from backend.ocr.page_runner import retry_rate_limited
 import asyncio
 
 class MultiProviderOCR:
@@ -38,8 +40,9 @@ class MultiProviderOCR:
         # Try each provider
         for provider_name in providers:
             try:
-                provider = OCRFactory.create_provider(provider_name)
-                result = await provider.extract_text(image, language)
+                provider = get_ocr_provider(provider_name)
+                # Retry throttled calls here so one busy provider doesn't drop out
+                result = await retry_rate_limited(lambda: provider.extract_text(image, language))
                 result['provider_used'] = provider_name
                 results.append(result)
             except Exception as e:
@@ -103,7 +106,7 @@ class MultiProviderOCR:
         tasks = []
         for provider_name in providers:
             try:
-                provider = OCRFactory.create_provider(provider_name)
+                provider = get_ocr_provider(provider_name)
                 tasks.append(self._extract_with_provider(provider, image, language, provider_name))
             except Exception:
                 continue
@@ -143,3 +146,12 @@ class MultiProviderOCR:
         except Exception as e:
             raise Exception(f"{provider_name} failed: {str(e)}")
 
+
+@lru_cache(maxsize=1)
+def get_multi_provider_ocr() -> MultiProviderOCR:
+    """
+    Shared MultiProviderOCR instance.
+    Probing which providers are configured instantiates every provider class,
+    so it is done once per worker rather than per request.
+    """
+    return MultiProviderOCR()
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional
 from backend.ocr.base_provider import OCRProvider
 from backend.ocr.tesseract_provider import TesseractProvider
@@ -115,6 +116,11 @@ class OCRFactory:
         if provider_name is None:
             provider_name = settings.OCR_PROVIDER.lower()
         
+        # Disabled names are rejected before any optional provider module is imported
+        if provider_name not in settings.enabled_providers:
+            available = ", ".join(sorted(settings.enabled_providers - {"multi", "best"}))
+            raise ValueError(f"Invalid OCR provider '{provider_name}'. Available: {available}")
+        
         providers = cls._get_providers()
         
         if provider_name not in providers:
@@ -132,53 +138,25 @@ class OCRFactory:
         
         return provider
     
+    @classmethod
+    def _is_usable(cls, provider_name: str) -> bool:
+        # Goes through the cached instances, so provider clients are not rebuilt on every check
+        try:
+            return get_ocr_provider(provider_name).is_available()
+        except Exception:
+            return False
+    
     @classmethod
     def get_available_providers(cls) -> list[str]:
         """Get list of available and configured providers"""
-        available = []
-        providers = cls._get_providers()
-        for name, provider_class in providers.items():
-            try:
-                provider = provider_class()
-                if provider.is_available() and name not in available:
-                    available.append(name)
-            except Exception:
-                pass
-
-        # If no providers are available, try to verify the default provider actually works
-        if not available:
-            default_provider = settings.OCR_PROVIDER.lower()
-            if default_provider in providers:
-                try:
-                    # Actually test if the default provider is available
-                    provider = providers[default_provider]()
-                    if provider.is_available():
-                        available.append(default_provider)
-                    else:
-                        # If default provider is not available, try to find any working provider
-                        for name, provider_class in providers.items():
-                            try:
-                                test_provider = provider_class()
-                                if test_provider.is_available():
-                                    available.append(name)
-                                    break
-                            except Exception:
-                                pass
-                except Exception:
-                    # If we can't instantiate the default provider, try others
-                    for name, provider_class in providers.items():
-                        if name != default_provider:
-                            try:
-                                test_provider = provider_class()
-                                if test_provider.is_available():
-                                    available.append(name)
-                                    break
-                            except Exception:
-                                pass
-
-        return available
+        return [name for name in cls._get_providers() if cls._is_usable(name)]
 
+@lru_cache(maxsize=8)
 def get_ocr_provider(provider_name: Optional[str] = None) -> OCRProvider:
-    """Convenience function to get OCR provider"""
+    """
+    Convenience function to get OCR provider.
+    Instances are cached per name, so each engine/client is set up once per
+    worker; failures are not cached and are retried on the next call.
+    """
     return OCRFactory.create_provider(provider_name)
 
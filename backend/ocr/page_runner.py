@@ -0,0 +1,307 @@
+import asyncio
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+from PIL import Image
+from backend.config import settings
+from backend.utils.file_handler import (
+    PDF_PAGE_BATCH_SIZE,
+    get_pdf_page_count,
+    iter_pdf_page_batches,
+    load_pdf_page,
+)
+
+PageExtractor = Callable[[Image.Image], Awaitable[Dict[str, Any]]]
+# (1-based page number, OCR result or the exception the page raised)
+NumberedOutcome = Tuple[int, Union[Dict[str, Any], BaseException]]
+T = TypeVar("T")
+
+# Backoff for throttled cloud OCR calls: waits of 0.5s, 1s, ... capped at 8s
+OCR_RETRY_ATTEMPTS = 3
+OCR_RETRY_MIN_WAIT = 0.5
+OCR_RETRY_MAX_WAIT = 8.0
+# Providers re-raise API errors as plain exceptions, so throttling is recognised by message.
+# A bare "429" or "quota" would also match page ids, sizes and billing failures
+_RATE_LIMIT_MARKERS = (
+    "status 429", "429 too many", "429 resource", "rate limit", "ratelimit",
+    "too many requests", "throttl", "resource exhausted", "resource has been exhausted",
+)
+
+# Shared across requests; created on first use
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+# Per worker process, so the provider is set up once rather than per page
+_worker_tesseract = None
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an OCR call failed because the provider throttled it."""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in _RATE_LIMIT_MARKERS)
+
+
+async def retry_rate_limited(call: Callable[[], Awaitable[T]]) -> T:
+    """Await call(), retrying with exponential backoff while the provider throttles it."""
+    wait = OCR_RETRY_MIN_WAIT
+    for attempt in range(1, OCR_RETRY_ATTEMPTS + 1):
+        try:
+            return await call()
+        except Exception as e:
+            if attempt == OCR_RETRY_ATTEMPTS or not is_rate_limit_error(e):
+                raise
+        await asyncio.sleep(wait)
+        wait = min(wait * 2, OCR_RETRY_MAX_WAIT)
+
+
+def page_concurrency() -> int:
+    """Number of pages to OCR at once."""
+    return max(1, min(os.cpu_count() or 1, settings.OCR_CONCURRENCY))
+
+
+async def extract_image(extract: PageExtractor, image: Image.Image) -> Dict[str, Any]:
+    """Run one OCR call on a worker thread with its own event loop."""
+    return await asyncio.to_thread(lambda: asyncio.run(extract(image)))
+
+
+async def extract_pages(
+    extract: PageExtractor,
+    pages: Sequence[Image.Image],
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> List[Union[Dict[str, Any], BaseException]]:
+    """
+    OCR pages concurrently and return the results in page order.
+
+    Providers do their blocking work (Tesseract subprocesses, HTTP calls) inside
+    extract_text, so each page runs on a worker thread with its own event loop.
+    A page that fails yields its exception in place of a result. Pass a shared
+    semaphore to bound pages across several calls running at once.
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(page_concurrency())
+    return await asyncio.gather(
+        *(extract_image_limited(extract, page, semaphore) for page in pages),
+        return_exceptions=True,
+    )
+
+
+def can_extract_whole_pdf(provider: Any, page_count: int) -> bool:
+    """Whether a provider can OCR this PDF in one request instead of page by page."""
+    return hasattr(provider, "extract_pdf_pages") and page_count <= provider.max_pdf_pages
+
+
+async def extract_whole_pdf(provider: Any, file_path: str) -> List[Dict[str, Any]]:
+    """OCR a whole PDF in one provider request on a worker thread; one result per page."""
+    return await asyncio.to_thread(
+        lambda: asyncio.run(retry_rate_limited(lambda: provider.extract_pdf_pages(file_path)))
+    )
+
+
+async def extract_image_limited(
+    extract: PageExtractor, image: Image.Image, semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """extract_image, holding one of the semaphore's slots while it runs."""
+    async with semaphore:
+        return await extract_image(extract, image)
+
+
+async def _numbered(page_number: int, outcome: Awaitable[Dict[str, Any]]) -> NumberedOutcome:
+    try:
+        return page_number, await outcome
+    except Exception as e:
+        return page_number, e
+
+
+async def iter_pdf_page_results(
+    file_path: str, extract: PageExtractor, batch_size: int = PDF_PAGE_BATCH_SIZE
+) -> AsyncIterator[NumberedOutcome]:
+    """
+    OCR every page of a PDF and yield (page number, result) as each page finishes.
+
+    Pages are rasterized a batch at a time on a worker thread; the next batch is
+    rendered while the previous one is still being OCR'd, and one semaphore
+    bounds the pages in flight across both. A page that fails yields its
+    exception in place of a result.
+    """
+    semaphore = asyncio.Semaphore(page_concurrency())
+    batches = iter_pdf_page_batches(file_path, batch_size)
+    pending: List[asyncio.Future] = []
+    next_page = 1
+    while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+        running = [
+            asyncio.ensure_future(
+                _numbered(next_page + index, extract_image_limited(extract, page, semaphore))
+            )
+            for index, page in enumerate(batch)
+        ]
+        next_page += len(batch)
+        for done in asyncio.as_completed(pending):
+            yield await done
+        pending = running
+    for done in asyncio.as_completed(pending):
+        yield await done
+
+
+def page_summary(page_index: int, page_result: Dict[str, Any], provider: str) -> Dict[str, Any]:
+    """The per-page entry stored in extracted_data["page_results"]."""
+    return {
+        'page': page_index,
+        'raw_text': page_result.get('raw_text', ''),
+        'confidence': page_result.get('confidence', 0.0),
+        'provider': page_result.get('provider_used', provider)
+    }
+
+
+def combine_page_outcomes(page_outcomes: List[NumberedOutcome], provider_name: str) -> Dict[str, Any]:
+    """Merge per-page OCR results (in page order) into one extraction result."""
+    selected_provider = provider_name
+    # Page texts go straight into one buffer; confidence is averaged from running totals
+    combined_text = io.StringIO()
+    confidence_total = 0.0
+    confidence_count = 0
+    page_results = []
+
+    for page_index, page_result in page_outcomes:
+        if isinstance(page_result, BaseException):
+            # Continue with other pages if one fails
+            print(f"Error processing page {page_index}: {str(page_result)}")
+            continue
+
+        if provider_name == "best" and page_index == 1:
+            selected_provider = page_result.get('provider_used', 'multi')
+
+        # Collect text and confidence from each page
+        if page_result.get('raw_text'):
+            if combined_text.tell():
+                combined_text.write("\n")
+            combined_text.write(f"\n--- Page {page_index} ---\n")
+            combined_text.write(page_result['raw_text'])
+            if page_result.get('confidence'):
+                confidence_total += page_result['confidence']
+                confidence_count += 1
+
+        page_results.append(page_summary(page_index, page_result, selected_provider))
+
+    avg_confidence = confidence_total / confidence_count if confidence_count else 0.0
+
+    return {
+        "raw_text": combined_text.getvalue(),
+        "confidence": round(avg_confidence, 2),
+        "structured_data": None,
+        "provider": selected_provider,
+        "pages_processed": len(page_outcomes),
+        "page_results": page_results
+    }
+
+
+def _init_ocr_worker() -> None:
+    # One Tesseract thread per worker; the pool already spreads pages across cores
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    global _ocr_pool
+    if _ocr_pool is None:
+        _ocr_pool = ProcessPoolExecutor(max_workers=page_concurrency(), initializer=_init_ocr_worker)
+    return _ocr_pool
+
+
+async def run_in_ocr_pool(func: Callable[..., T], *args: Any) -> T:
+    """Run other CPU-bound page work (e.g. preview rendering) on the shared OCR pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_ocr_pool(), func, *args)
+
+
+def shutdown_ocr_pool() -> None:
+    """Stop the OCR pool's worker processes, if it was started."""
+    global _ocr_pool
+    if _ocr_pool is not None:
+        _ocr_pool.shutdown(cancel_futures=True)
+        _ocr_pool = None
+
+
+def _tesseract_page(image: Image.Image) -> Dict[str, Any]:
+    """OCR one page with Tesseract (runs in an OCR pool worker process)."""
+    global _worker_tesseract
+    if _worker_tesseract is None:
+        from backend.ocr.tesseract_provider import TesseractProvider
+        _worker_tesseract = TesseractProvider()
+    return asyncio.run(_worker_tesseract.extract_text(image, preprocess=True))
+
+
+async def extract_image_with_tesseract(image: Image.Image) -> Dict[str, Any]:
+    """OCR a single image with Tesseract on the shared process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_ocr_pool(), _tesseract_page, image)
+
+
+async def extract_pages_with_tesseract(
+    pages: Sequence[Image.Image],
+) -> List[Union[Dict[str, Any], BaseException]]:
+    """
+    OCR already-loaded pages with Tesseract on the shared process pool.
+
+    Results come back in page order; a page that fails yields its exception
+    in place of a result.
+    """
+    return await asyncio.gather(
+        *(extract_image_with_tesseract(page) for page in pages), return_exceptions=True
+    )
+
+
+def _tesseract_pdf_page(file_path: str, page_number: int) -> Dict[str, Any]:
+    """Render one PDF page and OCR it with Tesseract (runs in an OCR pool worker process)."""
+    return _tesseract_page(load_pdf_page(file_path, page_number))
+
+
+def _submit_tesseract_pdf_pages(file_path: str, page_count: int) -> List[asyncio.Future]:
+    loop = asyncio.get_running_loop()
+    pool = _get_ocr_pool()
+    return [
+        loop.run_in_executor(pool, _tesseract_pdf_page, file_path, page_number)
+        for page_number in range(1, page_count + 1)
+    ]
+
+
+async def extract_pdf_pages_with_tesseract(
+    file_path: str, page_count: int,
+) -> List[Union[Dict[str, Any], BaseException]]:
+    """
+    Render and OCR every page of a PDF with Tesseract on the shared process pool,
+    in page order.
+
+    Each worker rasterizes its own page, so rendering never runs on the event
+    loop and only page numbers (not decoded images) cross the process boundary.
+    Preprocessing and result scoring are CPU-bound Python, so worker processes
+    scale where threads would contend for the GIL. The pool is shared by all
+    requests, so pages from concurrent re-extractions queue into the same
+    workers instead of each request starting its own.
+    """
+    futures = _submit_tesseract_pdf_pages(file_path, page_count)
+    return await asyncio.gather(*futures, return_exceptions=True)
+
+
+async def iter_tesseract_pdf_page_results(
+    file_path: str, page_count: int,
+) -> AsyncIterator[NumberedOutcome]:
+    """Like extract_pdf_pages_with_tesseract, but yield (page number, result) as each page finishes."""
+    futures = _submit_tesseract_pdf_pages(file_path, page_count)
+    numbered = [_numbered(page_number, future) for page_number, future in enumerate(futures, start=1)]
+    for done in asyncio.as_completed(numbered):
+        yield await done
+
+
+async def render_pdf_pages(file_path: str) -> List[Image.Image]:
+    """Rasterize every page of a PDF in parallel on the OCR process pool, in page order."""
+    page_count = await asyncio.to_thread(get_pdf_page_count, file_path)
+    if page_count == 0:
+        raise ValueError("PDF file is empty or corrupted")
+    loop = asyncio.get_running_loop()
+    pool = _get_ocr_pool()
+    return await asyncio.gather(
+        *(
+            loop.run_in_executor(pool, load_pdf_page, file_path, page_number)
+            for page_number in range(1, page_count + 1)
+        )
+    )
@@ -0,0 +1,38 @@
+"""
+In-process cache of OCR results keyed by file content and provider, so re-uploads
+of the same scan skip OCR entirely
+"""
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Combined results for this many distinct uploads are kept
+OCR_RESULT_CACHE_MAX_ENTRIES = 128
+
+# (ocr_result, provider actually used)
+CachedExtraction = Tuple[Dict[str, Any], str]
+
+_ocr_result_cache: "OrderedDict[Tuple[str, str], CachedExtraction]" = OrderedDict()
+_ocr_result_cache_lock = threading.Lock()
+
+
+def get_cached_ocr_result(digest: str, provider_name: str) -> Optional[CachedExtraction]:
+    """A copy of the cached extraction for this content and provider, if any."""
+    with _ocr_result_cache_lock:
+        entry = _ocr_result_cache.get((digest, provider_name))
+        if entry is None:
+            return None
+        _ocr_result_cache.move_to_end((digest, provider_name))
+    # Callers fill in structured_data, so never hand out the cached dict itself
+    ocr_result, provider_used = entry
+    return copy.deepcopy(ocr_result), provider_used
+
+
+def cache_ocr_result(digest: str, provider_name: str, ocr_result: Dict[str, Any], provider_used: str) -> None:
+    entry = (copy.deepcopy(ocr_result), provider_used)
+    with _ocr_result_cache_lock:
+        _ocr_result_cache[(digest, provider_name)] = entry
+        _ocr_result_cache.move_to_end((digest, provider_name))
+        while len(_ocr_result_cache) > OCR_RESULT_CACHE_MAX_ENTRIES:
+            _ocr_result_cache.popitem(last=False)
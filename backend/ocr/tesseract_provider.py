@@ -1,11 +1,24 @@
 import pytesseract
+import tempfile
+from contextlib import contextmanager
 from PIL import Image
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional
 from backend.ocr.base_provider import OCRProvider
 from backend.utils.image_preprocessing import enhance_for_ocr
 import os
 import platform
 
+@contextmanager
+def _image_file(image: Image.Image) -> Iterator[str]:
+    """Save an image uncompressed (BMP) to a temporary file for the tesseract binary to read."""
+    fd, image_path = tempfile.mkstemp(suffix=".bmp")
+    os.close(fd)
+    try:
+        image.save(image_path, format="BMP")
+        yield image_path
+    finally:
+        os.unlink(image_path)
+
 class TesseractProvider(OCRProvider):
     """Tesseract OCR provider - free, local OCR with enhanced settings"""
     
@@ -87,61 +100,64 @@ class TesseractProvider(OCRProvider):
             best_result = None
             best_confidence = 0.0
             
-            # Try different PSM modes and pick the best one
-            for psm_mode in psm_options:
-                try:
-                    # Enhanced Tesseract config for better results
-                    config = f"--psm {psm_mode} --oem {oem} -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789@.,:/-() "
+            # Written once and shared by every tesseract run below; pytesseract would
+            # otherwise PNG-encode the image to a new temp file for each call
+            with _image_file(image) as image_path:
+                # Try different PSM modes and pick the best one
+                for psm_mode in psm_options:
+                    try:
+                        # Enhanced Tesseract config for better results
+                        config = f"--psm {psm_mode} --oem {oem} -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789@.,:/-() "
                     
-                    # Extract text with confidence scores
-                    data = pytesseract.image_to_data(image, lang=lang, config=config, 
-                                                     output_type=pytesseract.Output.DICT)
+                        # Extract text with confidence scores
+                        data = pytesseract.image_to_data(image_path, lang=lang, config=config, 
+                                                         output_type=pytesseract.Output.DICT)
                     
-                    # Extract text with better configuration
-                    raw_text = pytesseract.image_to_string(image, lang=lang, config=config)
+                        # Extract text with better configuration
+                        raw_text = pytesseract.image_to_string(image_path, lang=lang, config=config)
                     
-                    # Calculate average confidence
-                    confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
-                    avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+                        # Calculate average confidence
+                        confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
+                        avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
                     
-                    # Count non-empty words
-                    words = [word for word in data['text'] if word.strip()]
-                    word_count = len(words)
+                        # Count non-empty words
+                        words = [word for word in data['text'] if word.strip()]
+                        word_count = len(words)
                     
-                    # Score: confidence * word_count (more words with good confidence = better)
-                    score = avg_confidence * (1 + word_count / 100)
+                        # Score: confidence * word_count (more words with good confidence = better)
+                        score = avg_confidence * (1 + word_count / 100)
                     
-                    if score > best_confidence or best_result is None:
-                        best_confidence = score
-                        best_result = {
-                            "raw_text": raw_text.strip(),
-                            "confidence": round(avg_confidence, 2),
-                            "word_count": word_count,
-                            "psm_mode": psm_mode,
-                            "structured_data": None,
-                            "provider": self.get_provider_name()
-                        }
-                except Exception as e:
-                    # If one PSM mode fails, try next
-                    continue
+                        if score > best_confidence or best_result is None:
+                            best_confidence = score
+                            best_result = {
+                                "raw_text": raw_text.strip(),
+                                "confidence": round(avg_confidence, 2),
+                                "word_count": word_count,
+                                "psm_mode": psm_mode,
+                                "structured_data": None,
+                                "provider": self.get_provider_name()
+                            }
+                    except Exception as e:
+                        # If one PSM mode fails, try next
+                        continue
             
-            if best_result is None:
-                # Fallback to basic extraction
-                config = f"--psm 6 --oem {oem}"
-                raw_text = pytesseract.image_to_string(image, lang=lang, config=config)
-                data = pytesseract.image_to_data(image, lang=lang, config=config, 
-                                                 output_type=pytesseract.Output.DICT)
-                confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
-                avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+                if best_result is None:
+                    # Fallback to basic extraction
+                    config = f"--psm 6 --oem {oem}"
+                    raw_text = pytesseract.image_to_string(image_path, lang=lang, config=config)
+                    data = pytesseract.image_to_data(image_path, lang=lang, config=config, 
+                                                     output_type=pytesseract.Output.DICT)
+                    confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
+                    avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
                 
-                best_result = {
-                    "raw_text": raw_text.strip(),
-                    "confidence": round(avg_confidence, 2),
-                    "word_count": len([w for w in data['text'] if w.strip()]),
-                    "psm_mode": 6,
-                    "structured_data": None,
-                    "provider": self.get_provider_name()
-                }
+                    best_result = {
+                        "raw_text": raw_text.strip(),
+                        "confidence": round(avg_confidence, 2),
+                        "word_count": len([w for w in data['text'] if w.strip()]),
+                        "psm_mode": 6,
+                        "structured_data": None,
+                        "provider": self.get_provider_name()
+                    }
             
             if best_result:
                 best_result.setdefault("pages_processed", 1)
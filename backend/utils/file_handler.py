@@ -1,12 +1,24 @@
+import hashlib
 import os
 import uuid
 import io
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO, Iterator, Tuple
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
 from PIL import Image
 from backend.config import settings
 import fitz  # PyMuPDF for PDF support
 
+# Bytes read from an upload per write
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# PDF pages rasterized (and held in memory) at a time
+PDF_PAGE_BATCH_SIZE = 10
+
+# Stored file paths are relative to this directory; resolved once at import
+UPLOAD_DIR = Path(settings.UPLOAD_DIR).resolve()
+
 def ensure_upload_dir():
     """Ensure upload directory exists"""
     upload_path = Path(settings.UPLOAD_DIR)
@@ -20,25 +32,63 @@ def ensure_documents_dir():
     documents_path.mkdir(parents=True, exist_ok=True)
     return documents_path
 
+@lru_cache(maxsize=1024)
+def resolve_upload_path(relative_path: str) -> Path:
+    """Absolute path of a stored upload; rejects paths that escape UPLOAD_DIR."""
+    full_path = (UPLOAD_DIR / relative_path).resolve()
+    if not full_path.is_relative_to(UPLOAD_DIR):
+        raise ValueError(f"File path outside upload directory: {relative_path}")
+    return full_path
+
 def validate_file(file: UploadFile) -> bool:
     """Validate uploaded file"""
     # Check file extension
-    file_ext = file.filename.split('.')[-1].lower() if file.filename else ""
-    if file_ext not in settings.ALLOWED_EXTENSIONS:
+    if get_file_extension(file.filename or "") not in settings.ALLOWED_EXTENSIONS:
         return False
     
     return True
 
 def get_file_extension(filename: str) -> str:
     """Get file extension from filename"""
-    return filename.split('.')[-1].lower()
+    # Scans from the right once instead of splitting on every dot
+    return filename.rpartition('.')[2].lower()
+
+def _copy_upload(source: BinaryIO, file_path: Path) -> Tuple[int, str]:
+    """Copy an upload's spooled body to disk in chunks, hashing it on the way (runs on a worker thread)."""
+    file_size = 0
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, "wb") as buffer:
+            while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > settings.MAX_FILE_SIZE:
+                    raise ValueError(f"File too large. Max size: {settings.MAX_FILE_SIZE / (1024*1024)}MB")
+                digest.update(chunk)
+                buffer.write(chunk)
+    except Exception:
+        file_path.unlink(missing_ok=True)
+        raise
+    return file_size, digest.hexdigest()
 
-async def save_uploaded_file(file: UploadFile) -> tuple[str, str]:
+async def _write_upload(file: UploadFile, file_path: Path) -> Tuple[int, str]:
+    """
+    Copy an upload to disk, with the whole copy on one worker thread.
+    
+    Returns:
+        Tuple of (bytes written, SHA-256 hex digest of the contents)
+    """
+    # The multipart parser already knows the size; oversized files never touch the disk
+    if file.size is not None and file.size > settings.MAX_FILE_SIZE:
+        raise ValueError(f"File too large. Max size: {settings.MAX_FILE_SIZE / (1024*1024)}MB")
+    await file.seek(0)
+    return await run_in_threadpool(_copy_upload, file.file, file_path)
+
+async def save_uploaded_file(file: UploadFile) -> tuple[str, str, str]:
     """
     Save uploaded file to disk
     
     Returns:
-        Tuple of (file_path, filename)
+        Tuple of (file_path, filename, sha256); filename is also the path relative to the upload directory
     """
     if not validate_file(file):
         raise ValueError(f"Invalid file type. Allowed: {', '.join(settings.ALLOWED_EXTENSIONS)}")
@@ -51,13 +101,28 @@ async def save_uploaded_file(file: UploadFile) -> tuple[str, str]:
     file_path = upload_dir / unique_filename
     
     # Save file
-    with open(file_path, "wb") as buffer:
-        content = await file.read()
-        if len(content) > settings.MAX_FILE_SIZE:
-            raise ValueError(f"File too large. Max size: {settings.MAX_FILE_SIZE / (1024*1024)}MB")
-        buffer.write(content)
+    _, sha256 = await _write_upload(file, file_path)
     
-    return str(file_path), unique_filename
+    return str(file_path), unique_filename, sha256
+
+def link_duplicate_upload(existing_path: Path, file_path: str) -> bool:
+    """
+    Replace a freshly saved upload with a hard link to an identical stored file, so
+    repeated uploads share one copy on disk. Each form keeps its own name, so
+    deleting either form leaves the other's file in place.
+    
+    Returns:
+        Whether the link was made (not possible across filesystems, or if the
+        earlier file is gone)
+    """
+    link_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.link(existing_path, link_path)
+        os.replace(link_path, file_path)
+    except OSError:
+        Path(link_path).unlink(missing_ok=True)
+        return False
+    return True
 
 async def save_document_file(file: UploadFile) -> tuple[str, str, int]:
     """
@@ -77,12 +142,7 @@ async def save_document_file(file: UploadFile) -> tuple[str, str, int]:
     file_path = documents_dir / unique_filename
     
     # Save file
-    with open(file_path, "wb") as buffer:
-        content = await file.read()
-        file_size = len(content)
-        if file_size > settings.MAX_FILE_SIZE:
-            raise ValueError(f"File too large. Max size: {settings.MAX_FILE_SIZE / (1024*1024)}MB")
-        buffer.write(content)
+    file_size, _ = await _write_upload(file, file_path)
     
     # Return relative path from uploads directory
     upload_dir = ensure_upload_dir()
@@ -103,58 +163,39 @@ def load_image(file_path: str) -> Image.Image:
         if file_ext == 'pdf':
             try:
                 # Open PDF and convert first page to image
-                pdf_document = fitz.open(file_path)
-                if len(pdf_document) == 0:
-                    raise ValueError("PDF file is empty or corrupted")
-                
-                # Get first page
-                page = pdf_document[0]
-                
-                # Convert to image with very high DPI for better OCR quality
-                # Scale factor of 3.0 = 216 DPI (excellent for OCR)
-                # Higher DPI = better text recognition
-                mat = fitz.Matrix(3.0, 3.0)
-                pix = page.get_pixmap(matrix=mat, alpha=False)
-                
-                # Convert to PIL Image
-                img_data = pix.tobytes("png")
-                image = Image.open(io.BytesIO(img_data))
-                
-                # Convert to RGB if necessary
-                if image.mode != 'RGB':
-                    image = image.convert('RGB')
-                
-                pdf_document.close()
-                return image
+                with fitz.open(file_path) as pdf_document:
+                    if len(pdf_document) == 0:
+                        raise ValueError("PDF file is empty or corrupted")
+                    
+                    return _render_pdf_page(pdf_document[0])
                 
             except Exception as pdf_error:
                 raise ValueError(f"Failed to process PDF: {str(pdf_error)}")
         
         # Handle image files
         else:
-            # Verify file exists and is readable
-            if not os.path.exists(file_path):
+            # Read the file once; verification and decoding both work from memory
+            try:
+                data = Path(file_path).read_bytes()
+            except FileNotFoundError:
                 raise ValueError(f"File not found: {file_path}")
-            
-            if not os.path.isfile(file_path):
+            except IsADirectoryError:
                 raise ValueError(f"Path is not a file: {file_path}")
             
-            # Check file size
-            file_size = os.path.getsize(file_path)
-            if file_size == 0:
+            if not data:
                 raise ValueError(f"File is empty: {file_path}")
             
             # Open and validate image
             try:
                 # First, try to open and verify the image
-                test_image = Image.open(file_path)
-                # Verify image is valid by loading it (this closes the file)
+                test_image = Image.open(io.BytesIO(data))
+                # Verify image is valid (the image cannot be used afterwards)
                 test_image.verify()
             except Exception as verify_error:
                 raise ValueError(f"Invalid or corrupted image file: {str(verify_error)}")
             
-            # Reopen image after verification (verify() closes the file)
-            image = Image.open(file_path)
+            # Reopen image after verification
+            image = Image.open(io.BytesIO(data))
             
             # Convert to RGB if necessary (for JPEG compatibility)
             if image.mode in ('RGBA', 'LA', 'P'):
@@ -175,6 +216,61 @@ def load_image(file_path: str) -> Image.Image:
     except Exception as e:
         raise ValueError(f"Failed to load image: {str(e)}")
 
+def _pdf_render_scale(page) -> float:
+    """
+    Zoom for rasterizing a page: OCR_RENDER_DPI, reduced so the long edge fits
+    OCR_PREPROCESSING_MAX_DIMENSION (preprocessing would only downscale it again).
+    """
+    scale = settings.OCR_RENDER_DPI / 72
+    max_dimension = settings.OCR_PREPROCESSING_MAX_DIMENSION
+    if max_dimension > 0:
+        # Page sizes are in points (1/72 inch)
+        scale = min(scale, max_dimension / max(page.rect.width, page.rect.height))
+    return scale
+
+def _render_pdf_page(page) -> Image.Image:
+    """Rasterize a PyMuPDF page to an RGB PIL Image."""
+    # High DPI for OCR quality (216 DPI by default), but never larger than OCR uses
+    scale = _pdf_render_scale(page)
+    mat = fitz.Matrix(scale, scale)
+    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, alpha=False)
+
+    # Wrap the raw RGB samples directly (no PNG encode/decode round-trip)
+    return Image.frombytes('RGB', (pix.width, pix.height), pix.samples)
+
+def get_pdf_page_count(file_path: str) -> int:
+    """Return the number of pages in a PDF without rendering any of them."""
+    try:
+        with fitz.open(file_path) as pdf_document:
+            return len(pdf_document)
+    except Exception as e:
+        raise ValueError(f"Failed to read PDF: {str(e)}")
+
+def get_page_count(file_path: str) -> int:
+    """Return the number of previewable pages in an uploaded form (1 for images)."""
+    if get_file_extension(file_path) == 'pdf':
+        return get_pdf_page_count(file_path)
+    return 1
+
+def load_pdf_page(file_path: str, page_number: int) -> Image.Image:
+    """
+    Load a single page from a PDF file as an image.
+    
+    Args:
+        file_path: Path to PDF file
+        page_number: 1-indexed page number
+    
+    Returns:
+        PIL Image of the requested page
+    """
+    try:
+        with fitz.open(file_path) as pdf_document:
+            if page_number < 1 or page_number > len(pdf_document):
+                raise ValueError(f"Page {page_number} not found. PDF has {len(pdf_document)} pages.")
+            return _render_pdf_page(pdf_document[page_number - 1])
+    except Exception as e:
+        raise ValueError(f"Failed to process PDF page: {str(e)}")
+
 def load_all_pdf_pages(file_path: str) -> list[Image.Image]:
     """
     Load all pages from a PDF file as images.
@@ -192,33 +288,28 @@ def load_all_pdf_pages(file_path: str) -> list[Image.Image]:
             # For non-PDF files, return single image
             return [load_image(file_path)]
         
-        pdf_document = fitz.open(file_path)
-        if len(pdf_document) == 0:
-            raise ValueError("PDF file is empty or corrupted")
-        
-        images = []
-        
-        # Process each page
-        for page_num in range(len(pdf_document)):
-            page = pdf_document[page_num]
-            
-            # Convert to image with very high DPI for better OCR quality
-            mat = fitz.Matrix(3.0, 3.0)
-            pix = page.get_pixmap(matrix=mat, alpha=False)
-            
-            # Convert to PIL Image
-            img_data = pix.tobytes("png")
-            image = Image.open(io.BytesIO(img_data))
-            
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            images.append(image)
-        
-        pdf_document.close()
-        return images
+        return [image for batch in iter_pdf_page_batches(file_path) for image in batch]
         
     except Exception as e:
         raise ValueError(f"Failed to process PDF pages: {str(e)}")
 
+def iter_pdf_page_batches(
+    file_path: str, batch_size: int = PDF_PAGE_BATCH_SIZE
+) -> Iterator[list[Image.Image]]:
+    """
+    Render a PDF a batch of pages at a time.
+    
+    Only one batch of rasterized pages is alive at once, so long PDFs can be
+    OCR'd batch by batch without holding every page in memory.
+    """
+    try:
+        with fitz.open(file_path) as pdf_document:
+            page_count = len(pdf_document)
+            if page_count == 0:
+                raise ValueError("PDF file is empty or corrupted")
+            
+            for start in range(0, page_count, batch_size):
+                stop = min(start + batch_size, page_count)
+                yield [_render_pdf_page(pdf_document[index]) for index in range(start, stop)]
+    except Exception as e:
+        raise ValueError(f"Failed to process PDF pages: {str(e)}")
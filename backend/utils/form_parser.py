@@ -6,6 +6,17 @@ import re
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+_WHITESPACE_RE = re.compile(r'\s+')
+_OCR_ARTIFACTS_RE = re.compile(r'[^\w\s@.,\-+()\/]')
+_NON_PHONE_RE = re.compile(r'[^\d+]')
+_NON_DATE_RE = re.compile(r'[^\d\/\-\.]')
+_NON_ID_RE = re.compile(r'[^\d\-]')
+_NON_DECIMAL_RE = re.compile(r'[^\d\.]')
+_NON_DIGIT_RE = re.compile(r'\D')
+_LETTER_RE = re.compile(r'[a-zA-Z]')
+# Same test as the original 'srcc' / 'data form' substring checks on the lowercased name
+_SRCC_NAME_RE = re.compile(r'srcc|data form', re.IGNORECASE)
+
 class SRCCFormParser:
     """Parser for SRCC DATA FORM format"""
     
@@ -174,6 +185,13 @@ class SRCCFormParser:
         ],
     }
     
+    # Compiled once for every parse (re's own cache only holds 512 patterns and is
+    # still a lookup per search)
+    COMPILED_PATTERNS = {
+        field_name: [re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in patterns]
+        for field_name, patterns in FIELD_PATTERNS.items()
+    }
+    
     def parse(self, raw_text: str) -> Dict[str, Any]:
         """
         Parse OCR text and extract structured information
@@ -185,27 +203,23 @@ class SRCCFormParser:
             Dictionary with extracted fields
         """
         parsed = {}
-        text = raw_text
-        text_lower = text.lower()
         
         # Normalize text - remove extra spaces, handle line breaks
-        text = re.sub(r'\s+', ' ', text)
-        lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
+        text = _WHITESPACE_RE.sub(' ', raw_text)
         
         # Extract each field
-        for field_name, patterns in self.FIELD_PATTERNS.items():
-            value = self._extract_field(text, text_lower, lines, patterns, field_name)
+        for field_name, patterns in self.COMPILED_PATTERNS.items():
+            value = self._extract_field(text, patterns, field_name)
             if value:
                 parsed[field_name] = value
         
         return parsed
     
-    def _extract_field(self, text: str, text_lower: str, lines: list, 
-                      patterns: list, field_name: str) -> Optional[str]:
+    def _extract_field(self, text: str, patterns: list, field_name: str) -> Optional[str]:
         """Extract a single field using multiple patterns"""
         for pattern in patterns:
             try:
-                match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+                match = pattern.search(text)
                 if match:
                     value = match.group(1) if match.lastindex >= 1 else match.group(0)
                     if value:
@@ -222,8 +236,8 @@ class SRCCFormParser:
         value = value.strip()
         
         # Remove common OCR artifacts
-        value = re.sub(r'[^\w\s@.,\-+()\/]', '', value)
-        value = re.sub(r'\s+', ' ', value)
+        value = _OCR_ARTIFACTS_RE.sub('', value)
+        value = _WHITESPACE_RE.sub(' ', value)
         
         # Field-specific cleaning
         if field_name in ['student_name', 'guardian_name', 'father_name', 'mother_name', 
@@ -237,25 +251,25 @@ class SRCCFormParser:
         elif field_name in ['phone_number', 'guardian_phone', 'father_phone', 'mother_phone',
                            'alternate_phone', 'emergency_contact_phone']:
             # Remove non-digit characters except +
-            value = re.sub(r'[^\d+]', '', value)
+            value = _NON_PHONE_RE.sub('', value)
         
         elif field_name in ['date_of_birth', 'admission_date']:
             # Normalize date format
-            value = re.sub(r'[^\d\/\-\.]', '', value)
+            value = _NON_DATE_RE.sub('', value)
         
         elif field_name in ['permanent_address', 'correspondence_address', 'tenth_school', 
                            'twelfth_school', 'previous_qualification', 'graduation_details']:
             # Clean address but keep structure
-            value = re.sub(r'\s+', ' ', value)
+            value = _WHITESPACE_RE.sub(' ', value)
             value = value.strip(',')
         
         elif field_name in ['aadhar_number', 'pincode', 'application_number']:
             # Remove spaces, keep numbers and hyphens
-            value = re.sub(r'[^\d\-]', '', value)
+            value = _NON_ID_RE.sub('', value)
         
         elif field_name in ['tenth_percentage', 'twelfth_percentage', 'annual_income']:
             # Keep numbers and decimal points
-            value = re.sub(r'[^\d\.]', '', value)
+            value = _NON_DECIMAL_RE.sub('', value)
         
         elif field_name in ['gender', 'category', 'blood_group']:
             # Uppercase
@@ -271,7 +285,7 @@ class SRCCFormParser:
         if field_name in ['student_name', 'guardian_name', 'father_name', 'mother_name', 
                          'emergency_contact_name', 'city', 'state']:
             # Name should be 2-50 chars, contain letters
-            return 2 <= len(value) <= 50 and re.search(r'[a-zA-Z]', value)
+            return 2 <= len(value) <= 50 and _LETTER_RE.search(value)
         
         elif field_name == 'email':
             # Email validation
@@ -280,7 +294,7 @@ class SRCCFormParser:
         elif field_name in ['phone_number', 'guardian_phone', 'father_phone', 'mother_phone',
                            'alternate_phone', 'emergency_contact_phone']:
             # Phone should be 10-15 digits
-            digits = re.sub(r'\D', '', value)
+            digits = _NON_DIGIT_RE.sub('', value)
             return 10 <= len(digits) <= 15
         
         elif field_name in ['date_of_birth', 'admission_date']:
@@ -293,12 +307,12 @@ class SRCCFormParser:
         
         elif field_name == 'aadhar_number':
             # Aadhar should be 12 digits
-            digits = re.sub(r'\D', '', value)
+            digits = _NON_DIGIT_RE.sub('', value)
             return len(digits) == 12
         
         elif field_name == 'pincode':
             # Pincode should be 6 digits
-            digits = re.sub(r'\D', '', value)
+            digits = _NON_DIGIT_RE.sub('', value)
             return len(digits) == 6
         
         elif field_name in ['course_applied', 'previous_qualification', 'tenth_school', 
@@ -336,6 +350,13 @@ class SRCCFormParser:
         
         return parsed
 
+# The parser keeps no per-call state, so one instance serves every request
+_SRCC_PARSER = SRCCFormParser()
+
+def is_srcc_filename(filename: Optional[str]) -> bool:
+    """Whether an uploaded file name marks it as an SRCC DATA FORM."""
+    return _SRCC_NAME_RE.search(filename or '') is not None
+
 def parse_form_text(raw_text: str, form_type: Optional[str] = None) -> Dict[str, Any]:
     """
     Main function to parse form text
@@ -347,5 +368,4 @@ def parse_form_text(raw_text: str, form_type: Optional[str] = None) -> Dict[str,
     Returns:
         Dictionary with extracted fields
     """
-    parser = SRCCFormParser()
-    return parser.parse(raw_text)
+    return _SRCC_PARSER.parse(raw_text)
@@ -1,10 +1,10 @@
 import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import { apiService, FormDetail } from '../services/api';
+import { apiService, FormListItem } from '../services/api';
 import './Dashboard.css';
 
 function Dashboard() {
-  const [forms, setForms] = useState<FormDetail[]>([]);
+  const [forms, setForms] = useState<FormListItem[]>([]);
   const [loading, setLoading] = useState(true);
   const [stats, setStats] = useState({
     total: 0,
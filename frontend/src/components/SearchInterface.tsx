@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import { apiService, FormDetail, Document, DocumentCategory, FormSearchQuery } from '../services/api';
+import { apiService, FormListItem, Document, DocumentCategory, FormSearchQuery } from '../services/api';
 import './SearchInterface.css';
 
 const FILTER_LABELS: Record<string, string> = {
@@ -39,7 +39,7 @@ function SearchInterface() {
     document_category: '',
     student_name: '',
   });
-  const [results, setResults] = useState<FormDetail[]>([]);
+  const [results, setResults] = useState<FormListItem[]>([]);
   const [documentResults, setDocumentResults] = useState<Document[]>([]);
   const [loading, setLoading] = useState(false);
   const [exporting, setExporting] = useState(false);
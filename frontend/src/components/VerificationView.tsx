@@ -1,4 +1,4 @@
-import { useState, useEffect, useMemo, useCallback } from 'react';
+import { useState, useEffect, useMemo, useCallback, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { apiService, FormDetail, FormVerification } from '../services/api';
 import { parseOCRText } from '../utils/ocrParser';
@@ -20,6 +20,11 @@ const PROVIDER_LABELS: Record<string, string> = {
   best: 'Automatic (Best)',
 };
 
+// Uploads return before OCR finishes; reload the form until extraction is done,
+// giving up after a while in case the extraction was lost (e.g. a server restart)
+const EXTRACTION_POLL_INTERVAL_MS = 2000;
+const EXTRACTION_POLL_TIMEOUT_MS = 5 * 60 * 1000;
+
 const FORM_FIELD_KEYS: (keyof FormVerification)[] = [
   'student_name',
   'date_of_birth',
@@ -159,6 +164,7 @@ function VerificationView() {
   const [totalPages, setTotalPages] = useState(1);
   const [isPdf, setIsPdf] = useState(false);
   const [showAllPages, setShowAllPages] = useState(false);
+  const extractionPollStartedAt = useRef<number | null>(null);
 
   const currentProviderLabel = useMemo(
     () => formatProviderName(form?.extracted_data?.provider || form?.ocr_provider),
@@ -213,6 +219,22 @@ function VerificationView() {
     loadProviders();
   }, [id]);
 
+  useEffect(() => {
+    if (!id || form?.status !== 'extracting') {
+      extractionPollStartedAt.current = null;
+      return;
+    }
+    if (extractionPollStartedAt.current === null) {
+      extractionPollStartedAt.current = Date.now();
+    } else if (Date.now() - extractionPollStartedAt.current > EXTRACTION_POLL_TIMEOUT_MS) {
+      alert('OCR is taking longer than expected. Reload the page later, or use Run OCR to try again.');
+      return;
+    }
+    const timer = window.setTimeout(() => loadForm(parseInt(id)), EXTRACTION_POLL_INTERVAL_MS);
+    return () => window.clearTimeout(timer);
+    // Re-runs after every reload (new form object), not only when the status changes
+  }, [id, form]);
+
   const loadProviders = async () => {
     try {
       const providers = await apiService.getProviders();
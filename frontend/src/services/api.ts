@@ -82,6 +82,18 @@ export interface StudentProfileDetail extends StudentProfile {
   documents: Document[];
 }
 
+// Row returned by the form list and search endpoints
+export interface FormListItem extends FormResponse {
+  student_profile_id?: number;
+  student_name?: string;
+  phone_number?: string;
+  email?: string;
+  course_applied?: string;
+  application_number?: string;
+  enrollment_number?: string;
+  verified_date?: string;
+}
+
 export interface FormDetail extends FormResponse {
   extracted_data?: ExtractedData;
   student_profile_id?: number;
@@ -216,8 +228,9 @@ export const apiService = {
   uploadForm: async (file: File, ocrProvider?: string): Promise<FormResponse> => {
     const formData = new FormData();
     formData.append('file', file);
+    // Returns once the file is stored; the verification view polls until OCR finishes
     const response = await api.post<FormResponse>('/api/upload', formData, {
-      params: ocrProvider ? { ocr_provider: ocrProvider } : undefined,
+      params: { async: true, ...(ocrProvider ? { ocr_provider: ocrProvider } : {}) },
       headers: {
         'Content-Type': 'multipart/form-data',
       },
@@ -232,8 +245,8 @@ export const apiService = {
   },
 
   // List forms
-  listForms: async (skip: number = 0, limit: number = 20, status?: string): Promise<FormDetail[]> => {
-    const response = await api.get<FormDetail[]>('/api/forms/', {
+  listForms: async (skip: number = 0, limit: number = 20, status?: string): Promise<FormListItem[]> => {
+    const response = await api.get<FormListItem[]>('/api/forms/', {
       params: { skip, limit, status },
     });
     return response.data;
@@ -266,11 +279,11 @@ export const apiService = {
   },
 
   // Search forms
-  searchForms: async (params: FormSearchQuery): Promise<FormDetail[]> => {
+  searchForms: async (params: FormSearchQuery): Promise<FormListItem[]> => {
     const sanitizedParams = Object.fromEntries(
       Object.entries(params).filter(([, value]) => value !== undefined && value !== '')
     );
-    const response = await api.get<FormDetail[]>('/api/forms/search/results', { params: sanitizedParams });
+    const response = await api.get<FormListItem[]>('/api/forms/search/results', { params: sanitizedParams });
     return response.data;
   },
 
@@ -0,0 +1,53 @@
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import AdmissionForm, StudentDocument, create_schema
+
+
+def test_create_schema_upgrades_existing_table():
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as connection:
+        # admission_forms as first released, before total_pages/file_sha256/updated_at
+        connection.execute(text(
+            "CREATE TABLE admission_forms (id INTEGER PRIMARY KEY, filename VARCHAR NOT NULL, "
+            "file_path VARCHAR NOT NULL, upload_date DATETIME, ocr_provider VARCHAR NOT NULL, "
+            "status VARCHAR(10))"
+        ))
+        # Index from an earlier release that idx_form_status_upload_id replaced
+        connection.execute(text(
+            "CREATE INDEX idx_form_status_upload ON admission_forms (status, upload_date)"
+        ))
+        connection.execute(text(
+            "INSERT INTO admission_forms (filename, file_path, ocr_provider, status) "
+            "VALUES ('old.pdf', 'old.pdf', 'tesseract', 'VERIFIED')"
+        ))
+
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE student_documents (id INTEGER PRIMARY KEY, filename VARCHAR NOT NULL, "
+            "file_path VARCHAR NOT NULL, upload_date DATETIME, document_category VARCHAR(20) NOT NULL, "
+            "description TEXT, file_size BIGINT NOT NULL, form_id INTEGER, student_profile_id INTEGER)"
+        ))
+        connection.execute(text(
+            "INSERT INTO student_documents (filename, file_path, document_category, file_size, form_id) "
+            "VALUES ('id.pdf', 'documents/id.pdf', 'ID_PROOF', 10, 1)"
+        ))
+
+    create_schema(engine)
+    create_schema(engine)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("admission_forms")}
+    indexes = {index["name"] for index in inspect(engine).get_indexes("admission_forms")}
+    assert set(AdmissionForm.__table__.columns.keys()) <= columns
+    assert {"ix_admission_forms_file_sha256", "idx_form_status_upload_id", "idx_form_upload_id"} <= indexes
+    assert "idx_form_status_upload" not in indexes
+    db = sessionmaker(bind=engine)()
+    try:
+        form = db.query(AdmissionForm).one()
+        assert form.filename == "old.pdf"
+        assert form.total_pages is None
+        # Backfilled, since the keyset cursors need a value
+        assert form.upload_date is not None
+        assert db.query(StudentDocument).one().upload_date is not None
+    finally:
+        db.close()
@@ -0,0 +1,107 @@
+from datetime import datetime
+from urllib.parse import parse_qs
+
+from fastapi import Response
+
+from backend.database import (
+    AdmissionForm,
+    StudentDocument,
+    DocumentCategory,
+    FormStatus,
+)
+from backend.api.routes.documents import get_form_documents, search_documents
+
+
+def create_form(session, **overrides):
+    form = AdmissionForm(
+        filename=overrides.pop("filename", "sample.pdf"),
+        file_path=overrides.pop("file_path", "sample.pdf"),
+        ocr_provider=overrides.pop("ocr_provider", "tesseract"),
+        status=overrides.pop("status", FormStatus.EXTRACTED),
+        **overrides,
+    )
+    session.add(form)
+    session.commit()
+    return form
+
+
+def create_document(session, **overrides):
+    document = StudentDocument(
+        filename=overrides.pop("filename", "id.pdf"),
+        file_path=overrides.pop("file_path", "documents/id.pdf"),
+        document_category=overrides.pop("document_category", DocumentCategory.ID_PROOF),
+        file_size=overrides.pop("file_size", 1024),
+        upload_date=overrides.pop("upload_date", datetime(2025, 1, 1, 10, 0, 0)),
+        **overrides,
+    )
+    session.add(document)
+    session.commit()
+    return document
+
+
+def test_get_form_documents_query_count(session, statements):
+    form_id = create_form(session).id
+    for day in range(1, 6):
+        create_document(session, form_id=form_id, upload_date=datetime(2025, 1, day))
+    session.expire_all()
+    statements.clear()
+
+    result = get_form_documents(form_id, db=session)
+
+    assert len(result) == 5
+    assert [doc.upload_date.day for doc in result] == [5, 4, 3, 2, 1]
+    assert len(statements) <= 2
+
+
+def run_search(session, response, **params):
+    defaults = {
+        "document_category": None,
+        "student_name": None,
+        "form_id": None,
+        "student_profile_id": None,
+        "date_from": None,
+        "date_to": None,
+        "page": 1,
+        "limit": 20,
+        "cursor_upload_date": None,
+        "cursor_id": None,
+    }
+    defaults.update(params)
+    return search_documents(response, db=session, **defaults)
+
+
+def test_search_documents_keyset_pagination(session):
+    form_id = create_form(session).id
+    for day in range(1, 6):
+        create_document(session, form_id=form_id, upload_date=datetime(2025, 1, day))
+
+    first_response = Response()
+    first_page = run_search(session, first_response, form_id=form_id, limit=2)
+    cursor = parse_qs(first_response.headers["X-Next-Cursor"])
+
+    second_page = run_search(
+        session,
+        Response(),
+        form_id=form_id,
+        limit=2,
+        cursor_upload_date=datetime.fromisoformat(cursor["cursor_upload_date"][0]),
+        cursor_id=int(cursor["cursor_id"][0]),
+    )
+
+    assert [doc.upload_date.day for doc in first_page] == [5, 4]
+    assert [doc.upload_date.day for doc in second_page] == [3, 2]
+
+
+def test_search_documents_date_range(session):
+    form_id = create_form(session).id
+    for day in range(1, 6):
+        create_document(session, form_id=form_id, upload_date=datetime(2025, 1, day))
+
+    result = run_search(
+        session,
+        Response(),
+        date_from=datetime(2025, 1, 2),
+        date_to=datetime(2025, 1, 4),
+    )
+
+    assert [doc.upload_date.day for doc in result] == [4, 3, 2]
@@ -0,0 +1,48 @@
+import asyncio
+
+from PIL import Image
+from starlette.requests import Request
+
+from backend.api.routes import files as files_routes
+from backend.config import settings
+from backend.database import AdmissionForm
+from backend.utils import file_handler
+
+
+def _request():
+    return Request({"type": "http", "method": "GET", "headers": []})
+
+
+def test_get_form_preview_rerenders_pruned_cache_entry(session, tmp_path, monkeypatch):
+    upload_dir = tmp_path / "uploads"
+    upload_dir.mkdir()
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(upload_dir))
+    monkeypatch.setattr(file_handler, "UPLOAD_DIR", upload_dir.resolve())
+    monkeypatch.setattr(files_routes, "PREVIEW_CACHE_DIR", tmp_path / "previews")
+    renders = []
+
+    async def inline_pool(func, *args):
+        renders.append(args)
+        return func(*args)
+
+    monkeypatch.setattr(files_routes, "run_in_ocr_pool", inline_pool)
+    Image.new("RGB", (20, 10), "white").save(upload_dir / "scan.tiff")
+    form = AdmissionForm(filename="scan.tiff", file_path="scan.tiff", ocr_provider="google")
+    session.add(form)
+    session.commit()
+
+    first = asyncio.run(files_routes.get_form_preview(form.id, _request(), page=1, db=session))
+    cached = list((tmp_path / "previews").glob("*.jpg"))
+    assert len(renders) == 1 and len(cached) == 1
+
+    # A cache hit serves the stored JPEG without rendering again
+    second = asyncio.run(files_routes.get_form_preview(form.id, _request(), page=1, db=session))
+    assert len(renders) == 1
+    assert second.body == first.body
+
+    # A concurrent prune removing the entry makes the next request render it again
+    cached[0].unlink()
+    third = asyncio.run(files_routes.get_form_preview(form.id, _request(), page=1, db=session))
+    assert len(renders) == 2
+    assert third.media_type == "image/jpeg"
+    assert third.body == first.body
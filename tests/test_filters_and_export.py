@@ -1,25 +1,24 @@
+import asyncio
+import csv
+import io
 import json
 from datetime import datetime
 
-import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import update
 
-from backend.database import Base, AdmissionForm, FormStatus
+from backend.database import AdmissionForm, FormStatus
 from backend.api.routes.forms import apply_form_filters
-from backend.api.routes.export import EXPORT_FIELDS, form_to_csv_row, form_to_json_dict
-
-
-@pytest.fixture
-def session():
-    engine = create_engine("sqlite:///:memory:")
-    TestingSession = sessionmaker(bind=engine)
-    Base.metadata.create_all(bind=engine)
-    db = TestingSession()
-    try:
-        yield db
-    finally:
-        db.close()
+from backend.api.routes import export as export_routes
+from backend.api.routes.export import (
+    EXPORT_FIELDS,
+    _cache_export_chunks,
+    _get_cached_export,
+    csv_export_chunks,
+    export_response,
+    form_to_csv_row,
+    form_to_json_dict,
+    json_export_chunks,
+)
 
 
 def create_form(session, **overrides):
@@ -118,3 +117,119 @@ def test_form_to_csv_row_alignment(session):
     assert header_to_value["Enrollment Number"] == "ENR-2025-009"
     assert json.loads(header_to_value["Additional Info"]) == info
 
+
+
+def test_json_export_chunks_form_valid_document(session):
+    create_form(session, student_name="First Export")
+    create_form(session, student_name="Second Export")
+
+    forms = session.query(AdmissionForm).order_by(AdmissionForm.id).yield_per(1)
+    payload = json.loads(b"".join(json_export_chunks(forms, {"status": "verified"})))
+
+    assert payload["count"] == 2
+    assert payload["filters"] == {"status": "verified"}
+    assert [form["student_name"] for form in payload["forms"]] == ["First Export", "Second Export"]
+
+
+def test_json_export_chunks_empty(session):
+    payload = json.loads(b"".join(json_export_chunks([], {})))
+
+    assert payload["count"] == 0
+    assert payload["forms"] == []
+
+
+def test_export_to_csv_batches_rows(session, monkeypatch):
+    monkeypatch.setattr("backend.api.routes.export.CSV_BATCH_SIZE", 2)
+    for index in range(5):
+        create_form(session, student_name=f"Student {index}")
+
+    response = export_response(
+        "csv", csv_export_chunks(session.query(AdmissionForm).order_by(AdmissionForm.id).all())
+    )
+
+    async def collect():
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = asyncio.run(collect())
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+
+    assert len(chunks) == 3
+    assert rows[0] == [header for _, header in EXPORT_FIELDS]
+    assert [row[8] for row in rows[1:]] == [f"Student {index}" for index in range(5)]
+
+
+def test_export_cache_reused_until_forms_change(session):
+    create_form(session, student_name="Cached Student")
+    key = "test-export-cache"
+
+    chunks = list(_cache_export_chunks(key, csv_export_chunks(session.query(AdmissionForm).all())))
+
+    assert _get_cached_export(key) == chunks
+
+    create_form(session, student_name="New Student")
+
+    assert _get_cached_export(key) is None
+
+
+def test_export_cache_skips_exports_over_size_budget(session, monkeypatch):
+    monkeypatch.setattr(export_routes, "EXPORT_CACHE_MAX_ENTRY_BYTES", 10)
+    for index in range(3):
+        create_form(session, student_name=f"Large Export {index}")
+
+    key = "test-export-too-large"
+    chunks = list(_cache_export_chunks(key, csv_export_chunks(session.query(AdmissionForm).all())))
+
+    assert "Large Export 2" in "".join(chunks)
+    assert _get_cached_export(key) is None
+
+
+def test_export_cache_evicts_by_total_size(monkeypatch):
+    monkeypatch.setattr(export_routes, "EXPORT_CACHE_MAX_BYTES", 10)
+    export_routes._invalidate_export_cache()
+
+    list(_cache_export_chunks("first", iter(["123456"])))
+    list(_cache_export_chunks("second", iter(["abcdef"])))
+
+    assert _get_cached_export("first") is None
+    assert _get_cached_export("second") == ["abcdef"]
+    assert export_routes._export_cache_size == 6
+
+
+def test_export_cache_cleared_by_bulk_update(session):
+    form = create_form(session, student_name="Cached Student")
+    key = "test-export-cache-bulk"
+    list(_cache_export_chunks(key, csv_export_chunks([form])))
+
+    session.execute(
+        update(AdmissionForm).where(AdmissionForm.id == form.id).values(city="Delhi")
+    )
+
+    assert _get_cached_export(key) is None
+
+
+def test_cached_json_export_gets_fresh_generated_at(session, monkeypatch):
+    create_form(session, student_name="Envelope Student")
+    stamps = iter([datetime(2025, 3, 1, 9, 0), datetime(2025, 3, 1, 9, 0, 30)])
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return next(stamps)
+
+    monkeypatch.setattr(export_routes, "datetime", FakeDatetime)
+
+    async def export():
+        response = await export_routes.export_forms(
+            format="json", status=None, student_name="envelope", phone_number=None,
+            email=None, enrollment_number=None, application_number=None,
+            course_applied=None, date_from=None, date_to=None, db=session,
+        )
+        return json.loads(b"".join([chunk async for chunk in response.body_iterator]))
+
+    first = asyncio.run(export())
+    second = asyncio.run(export())
+
+    assert first["generated_at"] == "2025-03-01T09:00:00"
+    assert second["generated_at"] == "2025-03-01T09:00:30"
+    assert first["forms"] == second["forms"]
+    assert second["count"] == 1
@@ -0,0 +1,384 @@
+import asyncio
+import io
+from datetime import datetime
+from urllib.parse import parse_qs
+
+import pytest
+from fastapi import Request, Response, UploadFile
+
+from backend.database import (
+    AdmissionForm,
+    StudentDocument,
+    DocumentCategory,
+    FormStatus,
+    StudentProfile,
+)
+from backend.api.routes import documents as documents_routes
+from backend.api.routes import forms as forms_routes
+from backend.api.routes.forms import (
+    FORM_DETAIL_FIELDS,
+    get_form,
+    list_forms,
+    search_forms,
+    update_form,
+    verify_form,
+)
+from backend.models.form import FormVerification
+
+
+@pytest.fixture(autouse=True)
+def clear_form_detail_cache():
+    forms_routes._form_detail_cache.clear()
+    yield
+    forms_routes._form_detail_cache.clear()
+
+
+def create_form_with_documents(session, document_count, **overrides):
+    form = AdmissionForm(
+        filename="sample.pdf",
+        file_path="sample.pdf",
+        ocr_provider="tesseract",
+        status=overrides.pop("status", FormStatus.EXTRACTED),
+        **overrides,
+    )
+    session.add(form)
+    session.flush()
+    for day in range(1, document_count + 1):
+        session.add(
+            StudentDocument(
+                form_id=form.id,
+                filename="id.pdf",
+                file_path="documents/id.pdf",
+                document_category=DocumentCategory.ID_PROOF,
+                file_size=1024,
+                upload_date=datetime(2025, 1, day),
+            )
+        )
+    session.commit()
+    return form
+
+
+def test_list_forms_selects_list_columns_only(session, statements):
+    for _ in range(4):
+        create_form_with_documents(session, 3, student_name="Asha Rao")
+    session.expire_all()
+    statements.clear()
+
+    result = list_forms(Response(), skip=0, limit=20, status=None, include_total=False, db=session)
+
+    assert len(result) == 4
+    assert result[0].student_name == "Asha Rao"
+    assert not hasattr(result[0], "documents")
+    assert len(statements) == 1
+    assert "extracted_data" not in statements[0]
+
+
+def test_list_forms_include_total(session, statements):
+    for status in (FormStatus.EXTRACTED, FormStatus.EXTRACTED, FormStatus.VERIFIED):
+        create_form_with_documents(session, 0, status=status)
+    statements.clear()
+
+    response = Response()
+    result = list_forms(
+        response, skip=0, limit=1, status=FormStatus.EXTRACTED, include_total=True, db=session
+    )
+
+    assert len(result) == 1
+    assert response.headers["X-Total-Count"] == "2"
+    assert len(statements) == 1
+
+
+def make_request(if_none_match=None):
+    headers = []
+    if if_none_match:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "headers": headers})
+
+
+def test_get_form_loads_documents_with_join(session, statements):
+    form_id = create_form_with_documents(session, 3).id
+    session.expire_all()
+    statements.clear()
+
+    result = get_form(form_id, make_request(), Response(), db=session)
+
+    assert [doc.upload_date.day for doc in result.documents] == [3, 2, 1]
+    # Version probe for the ETag, then the joined form + documents load
+    assert len(statements) == 2
+
+
+def test_get_form_etag_revalidation(session, statements):
+    form_id = create_form_with_documents(session, 1).id
+    first = Response()
+    get_form(form_id, make_request(), first, db=session)
+    etag = first.headers["ETag"]
+
+    statements.clear()
+    cached = get_form(form_id, make_request(etag), Response(), db=session)
+
+    assert cached.status_code == 304
+    assert len(statements) == 1
+
+    update_form(form_id, FormVerification(city="Delhi"), db=session)
+    changed = Response()
+    get_form(form_id, make_request(etag), changed, db=session)
+
+    assert changed.headers["ETag"] != etag
+
+
+def test_get_form_serves_unchanged_form_from_cache(session, statements):
+    form_id = create_form_with_documents(session, 2).id
+    first = get_form(form_id, make_request(), Response(), db=session)
+
+    statements.clear()
+    cached = get_form(form_id, make_request(), Response(), db=session)
+
+    assert cached == first
+    # Only the version probe runs
+    assert len(statements) == 1
+
+    update_form(form_id, FormVerification(city="Delhi"), db=session)
+    session.expire_all()
+    changed = get_form(form_id, make_request(), Response(), db=session)
+
+    assert changed.city == "Delhi"
+
+
+def replace_newest_document(session, form_id, monkeypatch):
+    async def fake_save_document_file(file):
+        return "documents/new.pdf", "documents/new.pdf", 2048
+
+    monkeypatch.setattr(documents_routes, "save_document_file", fake_save_document_file)
+    newest_id = max(document.id for document in session.query(StudentDocument))
+    documents_routes.delete_document(newest_id, db=session)
+    uploaded = asyncio.run(
+        documents_routes.upload_document(
+            file=UploadFile(io.BytesIO(b"new"), filename="new.pdf"),
+            document_category=DocumentCategory.OTHER.value,
+            description=None,
+            form_id=form_id,
+            student_profile_id=None,
+            db=session,
+        )
+    )
+    # SQLite hands the deleted id straight back out
+    assert uploaded.id == newest_id
+
+
+def test_get_form_cache_sees_replaced_document(session, monkeypatch):
+    form_id = create_form_with_documents(session, 2).id
+    get_form(form_id, make_request(), Response(), db=session)
+
+    replace_newest_document(session, form_id, monkeypatch)
+    session.expire_all()
+    result = get_form(form_id, make_request(), Response(), db=session)
+
+    assert [doc.filename for doc in result.documents][0] == "new.pdf"
+
+
+def test_get_form_etag_changes_when_document_replaced(session, monkeypatch):
+    form_id = create_form_with_documents(session, 2).id
+    first = Response()
+    get_form(form_id, make_request(), first, db=session)
+    etag = first.headers["ETag"]
+
+    replace_newest_document(session, form_id, monkeypatch)
+    changed = Response()
+    result = get_form(form_id, make_request(etag), changed, db=session)
+
+    assert not isinstance(result, Response)
+    assert changed.headers["ETag"] != etag
+
+
+def run_search(session, response, **params):
+    defaults = {
+        "student_name": None,
+        "phone_number": None,
+        "email": None,
+        "enrollment_number": None,
+        "application_number": None,
+        "course_applied": None,
+        "status": None,
+        "date_from": None,
+        "date_to": None,
+        "page": 1,
+        "limit": 20,
+        "cursor_upload_date": None,
+        "cursor_id": None,
+        "include_total": False,
+    }
+    defaults.update(params)
+    return search_forms(response, db=session, **defaults)
+
+
+def test_search_forms_selects_list_columns_only(session, statements):
+    for index in range(3):
+        create_form_with_documents(session, 2, student_name=f"Student {index}")
+    session.expire_all()
+    statements.clear()
+
+    result = run_search(session, Response(), student_name="student")
+
+    assert len(result) == 3
+    assert {form.student_name for form in result} == {"Student 0", "Student 1", "Student 2"}
+    assert len(statements) == 1
+
+
+def test_search_forms_keyset_pagination(session):
+    for day in range(1, 6):
+        create_form_with_documents(session, 0, upload_date=datetime(2025, 1, day))
+
+    first_response = Response()
+    first_page = run_search(session, first_response, limit=2)
+    cursor = parse_qs(first_response.headers["X-Next-Cursor"])
+
+    second_response = Response()
+    second_page = run_search(
+        session,
+        second_response,
+        limit=2,
+        cursor_upload_date=datetime.fromisoformat(cursor["cursor_upload_date"][0]),
+        cursor_id=int(cursor["cursor_id"][0]),
+    )
+
+    assert [form.upload_date.day for form in first_page] == [5, 4]
+    assert [form.upload_date.day for form in second_page] == [3, 2]
+    assert "X-Total-Count" not in second_response.headers
+
+
+def test_search_forms_reports_total_count(session):
+    for index in range(5):
+        create_form_with_documents(session, 0, student_name=f"Student {index}")
+
+    response = Response()
+    result = run_search(session, response, page=2, limit=2, include_total=True)
+    past_end = Response()
+    run_search(session, past_end, page=4, limit=2, include_total=True)
+    without_total = Response()
+    run_search(session, without_total, page=2, limit=2)
+
+    assert len(result) == 2
+    assert response.headers["X-Total-Count"] == "5"
+    assert past_end.headers["X-Total-Count"] == "5"
+    assert "X-Total-Count" not in without_total.headers
+
+
+def test_verify_form_updates_and_links_profile(session):
+    form_id = create_form_with_documents(session, 1).id
+
+    result = verify_form(
+        form_id,
+        FormVerification(student_name="Asha Rao", aadhar_number="1234", city="Delhi"),
+        db=session,
+    )
+
+    session.expire_all()
+    stored = session.get(AdmissionForm, form_id)
+    profile = session.query(StudentProfile).one()
+    assert result.status == FormStatus.VERIFIED
+    assert result.city == "Delhi"
+    assert len(result.documents) == 1
+    assert stored.status == FormStatus.VERIFIED
+    assert stored.student_profile_id == profile.id
+    assert profile.student_name == "Asha Rao"
+
+
+def test_update_form_keeps_existing_values_and_verified_date(session):
+    verified_at = datetime(2025, 2, 1, 9, 30)
+    form_id = create_form_with_documents(
+        session, 0, city="Pune", email="old@example.com", verified_date=verified_at
+    ).id
+
+    result = update_form(
+        form_id,
+        FormVerification(student_name="Asha Rao", email="new@example.com"),
+        db=session,
+    )
+
+    session.expire_all()
+    stored = session.get(AdmissionForm, form_id)
+    assert result.email == "new@example.com"
+    assert result.city == "Pune"
+    assert stored.status == FormStatus.VERIFIED
+    assert stored.verified_date == verified_at
+
+
+def test_form_verification_fields_match_form_columns():
+    # verify_form/update_form pass FormVerification.model_dump() straight to UPDATE
+    columns = set(AdmissionForm.__table__.columns.keys())
+
+    assert set(FormVerification.model_fields) == set(FORM_DETAIL_FIELDS) | {"additional_info"}
+    assert set(FormVerification.model_fields) <= columns
+
+
+def write_pdf(path, page_count):
+    import fitz
+
+    document = fitz.open()
+    for number in range(1, page_count + 1):
+        document.new_page().insert_text((72, 72), f"Page {number}")
+    document.save(path)
+    document.close()
+
+
+def test_re_extract_form_streams_pages_then_result(session, tmp_path, monkeypatch):
+    import orjson
+
+    write_pdf(tmp_path / "sample.pdf", 3)
+
+    class FakeProvider:
+        async def extract_text(self, image):
+            return {"raw_text": "text", "confidence": 90.0}
+
+    monkeypatch.setattr(forms_routes, "resolve_upload_path", lambda path: tmp_path / path)
+    monkeypatch.setattr(forms_routes, "get_ocr_provider", lambda name: FakeProvider())
+    form_id = create_form_with_documents(session, 0).id
+
+    async def collect():
+        response = await forms_routes.re_extract_form(
+            form_id, ocr_provider="google", stream=True, db=session
+        )
+        return [orjson.loads(line) async for line in response.body_iterator]
+
+    lines = asyncio.run(collect())
+
+    assert sorted(line["page"] for line in lines[:-1]) == [1, 2, 3]
+    assert lines[-1]["result"]["pages_processed"] == 3
+    session.expire_all()
+    assert session.get(AdmissionForm, form_id).status == FormStatus.EXTRACTED
+
+
+def test_autofill_values_keeps_found_form_fields_only():
+    structured_data = {"student_name": "Asha Rao", "email": "", "raw_text": "x", "enrollment_number": "E1"}
+
+    assert forms_routes.autofill_values(structured_data) == {
+        "student_name": "Asha Rao",
+        "enrollment_number": "E1",
+    }
+
+
+def test_re_extract_form_sends_whole_pdf_in_one_request(session, tmp_path, monkeypatch):
+    write_pdf(tmp_path / "sample.pdf", 3)
+    calls = []
+
+    class FakeDocumentProvider:
+        max_pdf_pages = 15
+
+        async def extract_text(self, image):
+            raise AssertionError("pages should not be sent one at a time")
+
+        async def extract_pdf_pages(self, file_path):
+            calls.append(file_path)
+            return [{"raw_text": f"text {number}", "confidence": 90.0} for number in range(1, 4)]
+
+    monkeypatch.setattr(forms_routes, "resolve_upload_path", lambda path: tmp_path / path)
+    monkeypatch.setattr(forms_routes, "get_ocr_provider", lambda name: FakeDocumentProvider())
+    form_id = create_form_with_documents(session, 0).id
+
+    result = asyncio.run(
+        forms_routes.re_extract_form(form_id, ocr_provider="google-documentai", stream=False, db=session)
+    ).result
+
+    assert calls == [str(tmp_path / "sample.pdf")]
+    assert [page.page for page in result.page_results] == [1, 2, 3]
+    assert "text 3" in result.raw_text
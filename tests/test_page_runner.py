@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from backend.config import settings
+from backend.ocr import page_runner
+from backend.ocr.page_runner import extract_pages, is_rate_limit_error, retry_rate_limited
+
+
+def test_extract_pages_keeps_order_and_shares_limit():
+    pages = [Image.new("RGB", (4, 4), (index, 0, 0)) for index in range(6)]
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    async def extract(page):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        index = page.getpixel((0, 0))[0]
+        if index == 4:
+            raise RuntimeError("unreadable page")
+        return {"raw_text": f"page {index}"}
+
+    async def run():
+        semaphore = asyncio.Semaphore(2)
+        return await asyncio.gather(
+            extract_pages(extract, pages[:3], semaphore),
+            extract_pages(extract, pages[3:], semaphore),
+        )
+
+    first, second = asyncio.run(run())
+
+    assert [result["raw_text"] for result in first] == ["page 0", "page 1", "page 2"]
+    assert second[0] == {"raw_text": "page 3"}
+    assert isinstance(second[1], RuntimeError)
+    assert peak <= 2
+
+
+def test_retry_rate_limited_retries_only_throttling(monkeypatch):
+    monkeypatch.setattr(page_runner, "OCR_RETRY_MIN_WAIT", 0)
+    calls = []
+
+    async def throttled_twice():
+        calls.append("throttled")
+        if len(calls) < 3:
+            raise Exception("Google Cloud Vision API error: 429 Resource exhausted")
+        return {"raw_text": "ok"}
+
+    assert asyncio.run(retry_rate_limited(throttled_twice)) == {"raw_text": "ok"}
+    assert len(calls) == 3
+
+    calls.clear()
+
+    async def broken():
+        calls.append("broken")
+        raise ValueError("Image has invalid dimensions")
+
+    with pytest.raises(ValueError):
+        asyncio.run(retry_rate_limited(broken))
+    assert len(calls) == 1
+
+
+def test_is_rate_limit_error_ignores_unrelated_429_and_quota():
+    assert is_rate_limit_error(Exception("Azure Vision API error: (429) Too Many Requests"))
+    assert is_rate_limit_error(Exception("ABBYY FineReader error: 429 Client Error: Too Many Requests for url: /v2/processImage"))
+    assert not is_rate_limit_error(Exception("Page 4291 could not be rendered"))
+    assert not is_rate_limit_error(Exception("Upload of 429 KB failed"))
+    assert not is_rate_limit_error(Exception("Quota exceeded for billing account"))
+
+
+def test_render_pdf_pages_keeps_page_order(tmp_path):
+    import fitz
+
+    document = fitz.open()
+    for width in (200, 300, 400):
+        document.new_page(width=width, height=100)
+    document.save(tmp_path / "pages.pdf")
+    document.close()
+
+    pages = asyncio.run(page_runner.render_pdf_pages(str(tmp_path / "pages.pdf")))
+
+    assert [page.width for page in pages] == [600, 900, 1200]
+
+
+def test_render_pdf_pages_caps_long_edge(tmp_path):
+    import fitz
+
+    document = fitz.open()
+    # A4 at the default 216 DPI would be 1786 x 2526 pixels
+    document.new_page(width=595, height=842)
+    document.save(tmp_path / "a4.pdf")
+    document.close()
+
+    (page,) = asyncio.run(page_runner.render_pdf_pages(str(tmp_path / "a4.pdf")))
+
+    assert max(page.size) <= settings.OCR_PREPROCESSING_MAX_DIMENSION
+    assert max(page.size) >= settings.OCR_PREPROCESSING_MAX_DIMENSION - 1
+
+
+def test_combine_page_outcomes_joins_text_and_skips_failures():
+    outcomes = [
+        (1, {"raw_text": "first", "confidence": 90.0}),
+        (2, RuntimeError("unreadable page")),
+        (3, {"raw_text": "", "confidence": 10.0}),
+        (4, {"raw_text": "last", "confidence": 80.0}),
+    ]
+
+    result = page_runner.combine_page_outcomes(outcomes, "tesseract")
+
+    assert result["raw_text"] == "\n--- Page 1 ---\nfirst\n\n--- Page 4 ---\nlast"
+    assert result["confidence"] == 85.0
+    assert result["pages_processed"] == 4
+    assert [page["page"] for page in result["page_results"]] == [1, 3, 4]
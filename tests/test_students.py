@@ -0,0 +1,117 @@
+from datetime import datetime
+
+from backend.database import (
+    AdmissionForm,
+    StudentDocument,
+    StudentProfile,
+    DocumentCategory,
+    FormStatus,
+)
+from backend.api.routes.students import (
+    create_student_profile,
+    get_student_forms,
+    get_student_profile,
+    list_student_profiles,
+    search_student_profiles,
+)
+
+
+def create_profile_with_forms(session, form_count, documents_per_form):
+    profile = StudentProfile(student_name="Asha Rao")
+    session.add(profile)
+    session.flush()
+    for _ in range(form_count):
+        form = AdmissionForm(
+            filename="sample.pdf",
+            file_path="sample.pdf",
+            ocr_provider="tesseract",
+            status=FormStatus.VERIFIED,
+            student_profile_id=profile.id,
+        )
+        session.add(form)
+        session.flush()
+        for day in range(1, documents_per_form + 1):
+            session.add(
+                StudentDocument(
+                    form_id=form.id,
+                    filename="id.pdf",
+                    file_path="documents/id.pdf",
+                    document_category=DocumentCategory.ID_PROOF,
+                    file_size=1024,
+                    upload_date=datetime(2025, 1, day),
+                )
+            )
+    session.commit()
+    return profile
+
+
+def test_get_student_profile_batches_form_documents(session, statements):
+    profile_id = create_profile_with_forms(session, 3, 2).id
+    session.expire_all()
+    statements.clear()
+
+    result = get_student_profile(profile_id, db=session)
+
+    assert result.forms_count == 3
+    assert all(len(form.documents) == 2 for form in result.forms)
+    # Profile, forms, their documents (one batch), profile documents
+    assert len(statements) == 4
+
+
+def test_get_student_forms_batches_form_documents(session, statements):
+    profile_id = create_profile_with_forms(session, 3, 2).id
+    session.expire_all()
+    statements.clear()
+
+    result = get_student_forms(profile_id, db=session)
+
+    assert len(result) == 3
+    assert [doc.upload_date.day for doc in result[0].documents] == [2, 1]
+    assert len(statements) == 3
+
+
+def test_list_student_profiles_counts_in_one_query(session, statements):
+    for _ in range(3):
+        create_profile_with_forms(session, 2, 1)
+    empty = StudentProfile(student_name="Ravi Kumar")
+    session.add(empty)
+    session.add(
+        StudentDocument(
+            student_profile_id=create_profile_with_forms(session, 0, 0).id,
+            filename="marks.pdf",
+            file_path="documents/marks.pdf",
+            document_category=DocumentCategory.ACADEMIC_CERTIFICATE,
+            file_size=2048,
+        )
+    )
+    session.commit()
+    session.expire_all()
+    statements.clear()
+
+    result = list_student_profiles(skip=0, limit=20, student_name=None, aadhar_number=None, db=session)
+
+    counts = sorted((profile.forms_count, profile.documents_count) for profile in result)
+    assert counts == [(0, 0), (0, 1), (2, 0), (2, 0), (2, 0)]
+    assert len(statements) == 1
+
+
+def test_search_student_profiles_paginates_profiles(session, statements):
+    for _ in range(3):
+        create_profile_with_forms(session, 2, 0)
+    session.expire_all()
+    statements.clear()
+
+    result = search_student_profiles(student_name="asha", aadhar_number=None, page=2, limit=2, db=session)
+
+    assert len(result) == 1
+    assert result[0].forms_count == 2
+    assert len(statements) == 1
+
+
+def test_create_student_profile_skips_refresh(session, statements):
+    result = create_student_profile(student_name="Meera Iyer", aadhar_number=None, db=session)
+
+    assert result.id is not None
+    assert result.created_date is not None
+    # Duplicate check, then the INSERT; no SELECT to reload the new row
+    assert sum(statement.lstrip().upper().startswith("SELECT") for statement in statements) == 1
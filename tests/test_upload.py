@@ -0,0 +1,250 @@
+import asyncio
+import hashlib
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import BackgroundTasks, Response, UploadFile
+from PIL import Image
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from backend.api.routes import upload as upload_routes
+from backend.config import settings
+from backend.database import AdmissionForm, FormStatus
+from backend.ocr import result_cache
+from backend.utils import file_handler
+from backend.utils.form_parser import is_srcc_filename
+
+
+def test_ocr_page_images_combines_pages_in_order(monkeypatch):
+    pages = [Image.new("RGB", (4, 4), (index, 0, 0)) for index in range(1, 4)]
+
+    class FakeProvider:
+        async def extract_text(self, image):
+            index = image.getpixel((0, 0))[0]
+            if index == 2:
+                raise RuntimeError("unreadable page")
+            return {"raw_text": f"text {index}", "confidence": 80.0 + index}
+
+    monkeypatch.setattr(upload_routes, "get_ocr_provider", lambda name: FakeProvider())
+
+    result = asyncio.run(upload_routes.ocr_page_images(pages, "google"))
+
+    assert [page["page"] for page in result["page_results"]] == [1, 3]
+    assert result["raw_text"] == "\n--- Page 1 ---\ntext 1\n\n--- Page 3 ---\ntext 3"
+    assert result["confidence"] == 82.0
+    assert result["pages_processed"] == 3
+    assert result["provider"] == "google"
+
+
+def test_write_upload_copies_body_and_rejects_oversized(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 10)
+    target = tmp_path / "form.pdf"
+
+    body = UploadFile(io.BytesIO(b"0123456789"), filename="form.pdf", size=10)
+    assert asyncio.run(file_handler._write_upload(body, target)) == (10, hashlib.sha256(b"0123456789").hexdigest())
+    assert target.read_bytes() == b"0123456789"
+
+    oversized = UploadFile(io.BytesIO(b"0123456789A"), filename="form.pdf", size=11)
+    with pytest.raises(ValueError, match="File too large"):
+        asyncio.run(file_handler._write_upload(oversized, tmp_path / "big.pdf"))
+    assert not (tmp_path / "big.pdf").exists()
+
+
+def test_upload_form_reuses_ocr_result_for_identical_file(session, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(result_cache, "_ocr_result_cache", type(result_cache._ocr_result_cache)())
+    calls = []
+
+    class FakeProvider:
+        async def extract_text(self, image):
+            calls.append(image.size)
+            return {"raw_text": "Name: Asha Rao", "confidence": 88.0}
+
+    monkeypatch.setattr(upload_routes, "get_ocr_provider", lambda name: FakeProvider())
+    scan = io.BytesIO()
+    Image.new("RGB", (8, 8), "white").save(scan, format="PNG")
+
+    def upload():
+        file = UploadFile(io.BytesIO(scan.getvalue()), filename="scan.png", size=len(scan.getvalue()))
+        return asyncio.run(upload_routes.upload_form(
+            BackgroundTasks(), Response(), file=file, ocr_provider="google", run_async=False, db=session
+        ))
+
+    first = upload()
+    second = upload()
+
+    assert len(calls) == 1
+    assert second.id != first.id
+    assert second.status == FormStatus.EXTRACTED
+    forms = session.query(AdmissionForm).order_by(AdmissionForm.id).all()
+    assert forms[1].extracted_data == forms[0].extracted_data
+    assert (tmp_path / forms[0].file_path).is_file()
+
+
+def test_upload_form_pages_skips_rendering_for_cached_pages(session, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(result_cache, "_ocr_result_cache", type(result_cache._ocr_result_cache)())
+    loads = []
+    load_upload_pages = upload_routes.load_upload_pages
+
+    async def counting_load(file_paths):
+        loads.append(len(file_paths))
+        return await load_upload_pages(file_paths)
+
+    class FakeProvider:
+        async def extract_text(self, image):
+            return {"raw_text": "page", "confidence": 88.0}
+
+    monkeypatch.setattr(upload_routes, "load_upload_pages", counting_load)
+    monkeypatch.setattr(upload_routes, "get_ocr_provider", lambda name: FakeProvider())
+    scans = []
+    for color in ("white", "black"):
+        scan = io.BytesIO()
+        Image.new("RGB", (8, 8), color).save(scan, format="PNG")
+        scans.append(scan.getvalue())
+
+    def upload():
+        files = [
+            UploadFile(io.BytesIO(data), filename=f"page{number}.png", size=len(data))
+            for number, data in enumerate(scans, start=1)
+        ]
+        return asyncio.run(upload_routes.upload_form_pages(files=files, ocr_provider="google", db=session))
+
+    first = upload()
+    second = upload()
+
+    assert loads == [2]
+    assert second.status == FormStatus.EXTRACTED
+    stored = session.get(AdmissionForm, second.id).extracted_data
+    assert stored == session.get(AdmissionForm, first.id).extracted_data
+
+
+def test_upload_form_reuses_stored_result_and_links_file(session, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(file_handler, "UPLOAD_DIR", tmp_path.resolve())
+    file_handler.resolve_upload_path.cache_clear()
+    calls = []
+
+    class FakeProvider:
+        async def extract_text(self, image):
+            calls.append(image.size)
+            return {"raw_text": "Name: Asha Rao", "confidence": 88.0}
+
+    monkeypatch.setattr(upload_routes, "get_ocr_provider", lambda name: FakeProvider())
+    scan = io.BytesIO()
+    Image.new("RGB", (8, 8), "gray").save(scan, format="PNG")
+
+    def upload():
+        # Empty the in-process cache so the stored form is what gets reused
+        monkeypatch.setattr(result_cache, "_ocr_result_cache", type(result_cache._ocr_result_cache)())
+        file = UploadFile(io.BytesIO(scan.getvalue()), filename="scan.png", size=len(scan.getvalue()))
+        return asyncio.run(upload_routes.upload_form(
+            BackgroundTasks(), Response(), file=file, ocr_provider="google", run_async=False, db=session
+        ))
+
+    upload()
+    upload()
+    file_handler.resolve_upload_path.cache_clear()
+
+    assert len(calls) == 1
+    first, second = session.query(AdmissionForm).order_by(AdmissionForm.id).all()
+    assert second.file_sha256 == first.file_sha256 == hashlib.sha256(scan.getvalue()).hexdigest()
+    assert second.extracted_data == first.extracted_data
+    assert second.file_path != first.file_path
+    assert (tmp_path / second.file_path).samefile(tmp_path / first.file_path)
+
+
+def test_get_file_extension_uses_last_suffix():
+    assert file_handler.get_file_extension("SRCC data form.v2.PDF") == "pdf"
+    assert file_handler.get_file_extension("") == ""
+
+
+def test_is_srcc_filename_matches_srcc_and_data_form():
+    for name in ("SRCC scan.pdf", "my_srcc.png", "Data Form 1.pdf", "DATA FORM.png"):
+        assert is_srcc_filename(name)
+    for name in ("admission.pdf", "DATA-FORM.png", "data_form.jpg", "dataform.pdf"):
+        assert not is_srcc_filename(name)
+    assert not is_srcc_filename(None)
+
+
+def test_upload_form_writes_form_once(session, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+
+    class FakeProvider:
+        async def extract_text(self, image):
+            return {"raw_text": "text", "confidence": 88.0}
+
+    monkeypatch.setattr(upload_routes, "get_ocr_provider", lambda name: FakeProvider())
+    scan = io.BytesIO()
+    Image.new("RGB", (8, 8), "black").save(scan, format="PNG")
+    file = UploadFile(io.BytesIO(scan.getvalue()), filename="once.png", size=len(scan.getvalue()))
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    result = asyncio.run(upload_routes.upload_form(
+        BackgroundTasks(), Response(), file=file, ocr_provider="google", run_async=False, db=session
+    ))
+
+    assert result.status == FormStatus.EXTRACTED
+    # Lookup of earlier uploads of the same file, then the single INSERT
+    assert [statement.split()[0] for statement in statements] == ["SELECT", "INSERT"]
+
+
+def test_upload_form_extracts_in_background(session, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(result_cache, "_ocr_result_cache", type(result_cache._ocr_result_cache)())
+    monkeypatch.setattr(upload_routes, "SessionLocal", sessionmaker(bind=session.get_bind()))
+
+    class FakeProvider:
+        async def extract_text(self, image):
+            return {"raw_text": "Name: Asha Rao", "confidence": 88.0}
+
+    monkeypatch.setattr(upload_routes, "get_ocr_provider", lambda name: FakeProvider())
+    scan = io.BytesIO()
+    Image.new("RGB", (8, 8), "blue").save(scan, format="PNG")
+    file = UploadFile(io.BytesIO(scan.getvalue()), filename="later.png", size=len(scan.getvalue()))
+    background_tasks = BackgroundTasks()
+    response = Response()
+
+    result = asyncio.run(
+        upload_routes.upload_form(
+            background_tasks, response, file=file, ocr_provider="google", run_async=True, db=session
+        )
+    )
+
+    assert response.status_code == 202
+    assert result.status == FormStatus.EXTRACTING
+    assert session.get(AdmissionForm, result.id).extracted_data is None
+
+    asyncio.run(background_tasks())
+    session.expire_all()
+
+    form = session.get(AdmissionForm, result.id)
+    assert form.status == FormStatus.EXTRACTED
+    assert form.extracted_data["raw_text"] == "Name: Asha Rao"
+
+
+def test_fail_stale_extractions_marks_only_old_extracting_forms(session, monkeypatch):
+    monkeypatch.setattr(upload_routes, "SessionLocal", sessionmaker(bind=session.get_bind()))
+    long_ago = datetime.utcnow() - timedelta(minutes=settings.OCR_STALE_EXTRACTION_MINUTES + 5)
+    forms = [
+        AdmissionForm(filename=name, file_path=name, ocr_provider="google", status=status, **changed)
+        for name, status, changed in (
+            ("lost.png", FormStatus.EXTRACTING, {"updated_at": long_ago}),
+            ("running.png", FormStatus.EXTRACTING, {}),
+            ("done.png", FormStatus.EXTRACTED, {"updated_at": long_ago}),
+        )
+    ]
+    session.add_all(forms)
+    session.commit()
+
+    assert upload_routes.fail_stale_extractions() == 1
+
+    session.expire_all()
+    assert [form.status for form in forms] == [FormStatus.ERROR, FormStatus.EXTRACTING, FormStatus.EXTRACTED]